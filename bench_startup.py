@@ -0,0 +1,61 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Measures how long a cold load of the level, main menu and intro asset
+sets takes, decoding on one thread and on the decode thread pool,
+with and without the on-disk decoded image cache.
+Run with `python bench_startup.py [repeats]`
+"""
+
+import logging
+import statistics
+import sys
+import time
+
+import pygame
+
+from game.common import HEIGHT, WIDTH
+from library.registry import ASSETS
+from library.sprite import cache, load
+
+STATES = ("level", "main_menu", "intro")
+
+
+def cold_load(state: str, workers: int, cached: bool) -> float:
+    """
+    Loads a state's assets with nothing resident, returns the time it took in ms
+    """
+    ASSETS.trim()
+    load.get_manifest.cache_clear()
+    load.DECODE_WORKERS = workers
+    cache.ENABLED = cached
+
+    start = time.perf_counter()
+    load.load_assets(state)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(repeats: int) -> None:
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.HIDDEN)
+    logging.disable(logging.INFO)
+
+    default_workers = load.DECODE_WORKERS
+    for state in STATES:
+        for workers in sorted({1, default_workers}):
+            for cached in (False, True):
+                # the first load also warms up the decode threads,
+                # the OS file cache and the decoded image cache
+                cold_load(state, workers, cached)
+                times = [cold_load(state, workers, cached) for _ in range(repeats)]
+
+                print(
+                    f"{state:<10} workers={workers} cached={cached!s:<5}  "
+                    f"median {statistics.median(times):6.2f}ms  "
+                    f"min {min(times):6.2f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -4,20 +4,64 @@ The source code is distributed under the MIT license.
 """
 
 import asyncio
-import json
 import logging
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 
 import pygame
 
-from game.common import AUDIO_DIR, DATA_DIR, HEIGHT, SAVE_DATA, WIDTH
+from game.common import DATA_DIR, HEIGHT, ROOT_DIR, SAVE_DATA, WIDTH
+from game.save import SaveWriter
 from game.states.credits import Credits
 from game.states.enums import States
 from game.states.intro import Dialogue
 from game.states.levels import Level
 from game.states.main_menu import MainMenu
+from library.events import EVENTS
+from library.pacing import FramePacer
+from library.perf import GC_POLICY, QUALITY, TRACER, SpikeWatchdog
+from library.registry import ASSETS, Lease
+from library.scheduler import SCHEDULER
+from library.ui.perf_overlay import PerfOverlay
+from library.utils import font
 
 logger = logging.getLogger()
 
+# The browser build has no threads, it builds states synchronously
+PREWARM = sys.platform != "emscripten"
+
+
+@dataclass
+class _Prewarm:
+    """
+    A game state being built ahead of time on the prewarm worker
+    """
+
+    state: States
+    switch_info: dict
+    # SAVE_DATA.generation the state was built from
+    generation: int
+    future: Future
+
+    def matches(self, state: States, switch_info: dict) -> bool:
+        return (
+            self.state == state
+            and self.switch_info == switch_info
+            and self.generation == SAVE_DATA.generation
+        )
+
+    def discard(self) -> None:
+        # The state may still be building,
+        # its assets are released once it's done
+        def release(future: Future) -> None:
+            # A failed build already released what it loaded
+            if future.exception() is None:
+                future.result()[1].release()
+
+        self.future.add_done_callback(release)
+
 
 class Game:
     """
@@ -25,6 +69,12 @@ class Game:
     """
 
     FPS_CAP = 60
+    # Resolution the world is drawn at relative to the window, the UI stays
+    # sharp. 0.5 draws a quarter of the pixels, for slow machines and captures
+    WORLD_SCALE = 1.0
+    TRACE_KEY = pygame.K_F4
+    # Frames taking longer than this many seconds get logged, None turns it off
+    SPIKE_THRESHOLD = 0.05
 
     def __init__(self):
         """
@@ -33,6 +83,29 @@ class Game:
         self.logging_config()
 
         self.alive = True
+        SCHEDULER.fps = self.FPS_CAP
+        # Drops the frame rate while the screen is static or in the background
+        self.pacer = FramePacer(self.FPS_CAP)
+        self.pacer.watch(EVENTS)
+        # Full collections only run after a state change,
+        # while its transition covers the screen
+        GC_POLICY.watch()
+        self.perf_overlay = PerfOverlay(QUALITY, GC_POLICY)
+        self.perf_overlay.watch(EVENTS)
+        # Spans are recorded between two presses, then written to a file
+        EVENTS.subscribe(pygame.KEYDOWN, self._toggle_trace, key=self.TRACE_KEY)
+        self.spike_watchdog = None
+        if self.SPIKE_THRESHOLD is not None:
+            # Spans are only written along while tracing,
+            # the object census runs in the next idle time
+            self.spike_watchdog = SpikeWatchdog(
+                ROOT_DIR / "spikes.jsonl", self.SPIKE_THRESHOLD, defer=SCHEDULER.add
+            )
+        # Seconds the last frame took to update and draw
+        self.frame_time = 0.0
+        self.save_writer = SaveWriter(
+            SAVE_DATA, DATA_DIR / "save.json", defer=SCHEDULER.add
+        )
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED)
         if SAVE_DATA["first_time"]:
             self.state: States = States.DIALOGUE
@@ -44,10 +117,103 @@ class Game:
             States.LEVEL: Level,
             States.MAIN_MENU: MainMenu,
             States.DIALOGUE: Dialogue,
-            States.CREDITS: Credits
+            States.CREDITS: Credits,
         }
-        self.game_state = self.perspective_states[self.state]({})
+        self.asset_lease = None
+        self.prewarm = None
+        self.prewarmer = ThreadPoolExecutor(1, thread_name_prefix="prewarm")
+        self.loading = False
+        self.game_state = self._install_state(
+            self.state, *self._build_state(self.state, {})
+        )
         self.clock = pygame.time.Clock()
+        EVENTS.subscribe(pygame.QUIT, self._quit)
+        self.present_all = True
+        for event_type in (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED):
+            EVENTS.subscribe(event_type, self._on_expose)
+
+    def _build_state(self, state: States, switch_info: dict):
+        """
+        Creates a game state, returns it along with
+        the lease holding on to the assets it loaded
+        """
+        with ASSETS.lease() as lease, TRACER.span(f"build {state.name}"):
+            try:
+                game_state = self.perspective_states[state](switch_info)
+            except Exception:
+                # Nothing will hold on to the assets loaded before the failure
+                lease.release()
+                raise
+
+        return game_state, lease
+
+    def _install_state(self, state: States, game_state, lease: Lease):
+        """
+        Makes a built game state the current one,
+        releasing the assets held by the previous state
+        """
+        # Released after the new state took its references,
+        # so assets shared by both states stay resident
+        if self.asset_lease is not None:
+            self.asset_lease.release()
+        self.asset_lease = lease
+
+        # Music and volume are set only now, states may be built on the
+        # prewarm worker while another state is playing
+        sfx_manager = getattr(game_state, "sfx_manager", None)
+        if sfx_manager is not None:
+            sfx_manager.start_bgm()
+
+        # States queueing their drawing get their world drawn at the world scale
+        draw_buffer = getattr(game_state, "draw_buffer", None)
+        if draw_buffer is not None:
+            draw_buffer.scale = self.WORLD_SCALE
+
+        self.state = state
+        self.game_state = game_state
+        GC_POLICY.state_changed()
+        return game_state
+
+    def _prewarm(self, state: States, switch_info: dict) -> None:
+        """
+        Starts building a game state on the prewarm worker,
+        unless it's already being built from the same data
+        """
+        if not PREWARM:
+            return
+
+        if self.prewarm is not None:
+            if self.prewarm.matches(state, switch_info):
+                return
+            # One state is built at a time, the next request
+            # is taken up once the current one is done
+            if not self.prewarm.future.done():
+                return
+            self.prewarm.discard()
+
+        logger.info(f"Prewarming {state}")
+        switch_info = dict(switch_info)
+        self.prewarm = _Prewarm(
+            state,
+            switch_info,
+            SAVE_DATA.generation,
+            self.prewarmer.submit(self._build_state, state, switch_info),
+        )
+
+    def _draw_loading(self) -> None:
+        dots = "." * (pygame.time.get_ticks() // 300 % 4)
+        text = font(size=24).render(f"loading{dots}", False, (218, 224, 234))
+        self.screen.blit(
+            text, text.get_rect(bottomleft=(16, self.screen.get_height() - 16))
+        )
+
+    def _draw_perf_overlay(self) -> None:
+        self.perf_overlay.draw(
+            self.screen,
+            self.perf_overlay.lines(
+                self.clock.get_fps(), self.frame_time, self.game_state
+            ),
+        )
 
     def _grab_events(self):
         """
@@ -57,6 +223,8 @@ class Game:
         # capping delta time to avoid bugs when moving the window
         dt = min(raw_dt * 100, 10)
         events = pygame.event.get()
+        # indexed once, components look up the events they handle
+        EVENTS.dispatch(events)
         mouse_press = pygame.mouse.get_pressed()
         mouse_pos = pygame.mouse.get_pos()
         key_press = pygame.key.get_pressed()
@@ -79,16 +247,65 @@ class Game:
         Handle dynamic switching of game states
         """
 
+        # States can name the state they'll likely switch to,
+        # so it's built ahead of time
+        upcoming_state = getattr(self.game_state, "upcoming_state", None)
+        if upcoming_state is not None:
+            self._prewarm(upcoming_state, self.game_state.switch_info)
+
+        self.loading = False
         if self.game_state.next_state is not None:
+            next_state = self.game_state.next_state
+            switch_info = self.game_state.switch_info
+
+            # Checked before saving, the fields changed by the
+            # switch itself don't make the prewarmed state stale
+            fresh = self.prewarm is not None and self.prewarm.matches(
+                next_state, switch_info
+            )
             self._save()
-            self.state = self.game_state.next_state
-            # Creating a new game state from the new state, and passing in
-            # the respective switch info for the next game state
-            # to access
-            self.game_state = self.perspective_states[self.state](
+            if fresh:
+                self.prewarm.generation = SAVE_DATA.generation
+
+            # Respawning in the same level only rebuilds the entities,
+            # the map, assets and sounds are kept as they are
+            if self.state == next_state == States.LEVEL and self.game_state.can_reset(
                 self.game_state.switch_info
-            )
+            ):
+                self.game_state.reset(SAVE_DATA["latest_checkpoint"])
+                GC_POLICY.state_changed()
+                return
+
+            if not PREWARM:
+                # Creating a new game state from the new state, and passing in
+                # the respective switch info for the next game state
+                # to access
+                self._install_state(
+                    next_state, *self._build_state(next_state, switch_info)
+                )
+                return
 
+            # The old state stays on screen with a loading indicator
+            # until the new one is built
+            self._prewarm(next_state, switch_info)
+            prewarm = self.prewarm
+            if not (prewarm.matches(next_state, switch_info) and prewarm.future.done()):
+                self.loading = True
+                return
+
+            self.prewarm = None
+            error = prewarm.future.exception()
+            if error is None:
+                built = prewarm.future.result()
+            else:
+                logger.error(
+                    f"Prewarming {next_state} failed, building it again",
+                    exc_info=error,
+                )
+                built = self._build_state(next_state, switch_info)
+            self._install_state(next_state, *built)
+
+    @TRACER.traced()
     def _save(self) -> None:
         """
         Saves all game related config
@@ -99,33 +316,130 @@ class Game:
             SAVE_DATA["last_volume"] = self.game_state.sound_icon.slider.value / 100
             print(SAVE_DATA)
 
-        with open(DATA_DIR / "save.json", "w") as f:
-            json.dump(SAVE_DATA, f, indent=2)
+        # written in the background, only if something changed
+        self.save_writer.save()
+
+    def _toggle_trace(self, _event: pygame.event.Event) -> None:
+        if not TRACER.enabled:
+            logger.info("Tracing started")
+            TRACER.start()
+            return
+
+        TRACER.stop()
+        path = ROOT_DIR / time.strftime("trace-%Y%m%d-%H%M%S.json")
+        n_spans = TRACER.export(path)
+        logger.info(f"Wrote {n_spans} spans to {path}")
+
+    def _quit(self, _event: pygame.event.Event) -> None:
+        self._save()
+        self.save_writer.flush()
+        self.alive = False
 
     async def _run(self):
         """
         Async method for WASM compatibility
         """
         while self.alive:
-            event_info = self._grab_events()
-            for event in event_info["events"]:
-                if event.type == pygame.QUIT:
-                    self._save()
-                    self.alive = False
-
-            self.game_state.update(event_info)
+            frame_start = time.perf_counter()
+            if self.spike_watchdog is not None:
+                self.spike_watchdog.begin_frame()
+            with TRACER.span("events"):
+                event_info = self._grab_events()
+            with TRACER.span("update"):
+                self.game_state.update(event_info)
 
-            self.screen.fill("grey19")
-            self.game_state.draw(self.screen)
+            # States tracking dirty regions repaint only what changed
+            regions = getattr(self.game_state, "regions", None)
+            with TRACER.span("draw"):
+                if regions is None:
+                    self.screen.fill("grey19")
+                self.game_state.draw(self.screen)
+            dirty_rects = None if regions is None else self.game_state.dirty_rects
 
             pygame.display.set_caption(
                 f"Dave's Anniversary: {self.clock.get_fps():.1f} FPS"
             )
 
-            self._handle_state_switch()
-            self.clock.tick(self.FPS_CAP)
+            # States without a dirty flag change every frame
+            dirty = self.loading or getattr(self.game_state, "dirty", True)
+            SCHEDULER.fps = self.pacer.target(dirty)
+            # Slow frames end as soon as there's input to handle
+            wake = None if SCHEDULER.fps == self.FPS_CAP else self.pacer.input_pending
+
+            frame_time = time.perf_counter() - frame_start
+            self.frame_time = frame_time
+            # Effects are scaled down while frames run over budget
+            QUALITY.record(frame_time)
+
+            if self.loading:
+                self._draw_loading()
+            if self.perf_overlay.visible:
+                self._draw_perf_overlay()
+            if self.loading or self.perf_overlay.visible:
+                dirty_rects = None
+                if regions is not None:
+                    # Drawn over the state, which has to repaint it all next frame
+                    regions.invalidate()
+
+            with TRACER.span("state switch"):
+                self._handle_state_switch()
+            transition = getattr(self.game_state, "transition", None)
+            with TRACER.span("gc"):
+                GC_POLICY.update(transition is not None and transition.covering)
+            # Background jobs run in the time left until the frame's
+            # deadline, the clock only measures the frame
+            idle_start = time.perf_counter()
+            with TRACER.span("idle"):
+                await SCHEDULER.idle(wake)
+            idle_time = time.perf_counter() - idle_start
+            self.clock.tick()
+            with TRACER.span("present"):
+                self._present(dirty_rects)
+
+            frame_end = time.perf_counter()
+            if TRACER.enabled:
+                TRACER.record("frame", frame_start, frame_end)
+            if self.spike_watchdog is not None:
+                self._check_spike(frame_end - frame_start - idle_time)
+
+    def _check_spike(self, busy: float) -> None:
+        stage = {}
+        if self.state == States.LEVEL:
+            stage = {
+                "dimension": self.game_state.current_dimension.value,
+                "paused": self.game_state.paused,
+            }
+
+        spike = self.spike_watchdog.end_frame(
+            busy,
+            state=self.state.name,
+            stage=stage,
+            loading=self.loading,
+            quality=QUALITY.tier.name,
+        )
+        if spike is not None:
+            slowest = max(
+                spike.get("spans", ()), key=lambda span: span["ms"], default=None
+            )
+            logger.warning(
+                f"Frame {spike['frame']} took {spike['ms']:.1f}ms"
+                + (f", {slowest['name']} {slowest['ms']:.1f}ms" if slowest else "")
+            )
+
+    def _present(self, dirty_rects) -> None:
+        """
+        Shows the frame, only the given regions of it if not None
+        """
+        if dirty_rects is None or self.present_all:
+            self.present_all = False
             pygame.display.flip()
-            await asyncio.sleep(0)
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        # Nothing changed, the window keeps showing the last frame
+
+    def _on_expose(self, _event: pygame.event.Event) -> None:
+        # The window lost what it showed, the next frame is presented whole
+        self.present_all = True
 
     def run(self):
         """
@@ -13,8 +13,10 @@ import pygame
 from game.common import HEIGHT, WIDTH
 from game.states.enums import Dimensions
 from library.particles import AngularParticle
+from library.perf.quality import QUALITY
 from library.ui.camera import Camera
 from library.utils.classes import Time
+from library.utils.funcs import scaled
 
 logger = logging.getLogger()
 
@@ -25,7 +27,7 @@ _BACKGROUND_COLORS = {
     Dimensions.VOLCANIC_DIMENSION: (19, 16, 15),
     Dimensions.MOON_DIMENSION: (20, 16, 19),
     Dimensions.WATER_DIMENSION: (7, 20, 39),
-    Dimensions.HOMELAND_DIMENSION: (14, 62, 87)
+    Dimensions.HOMELAND_DIMENSION: (14, 62, 87),
 }
 
 
@@ -63,9 +65,13 @@ class _Line:
         if not domino and self.start_pos.x >= WIDTH and self.start_pos.y >= HEIGHT:
             self.alive = False
 
-    def draw(self, screen):
+    def draw(self, screen, scale: float = 1):
         pygame.draw.line(
-            screen, (6, 6, 8), self.start_pos, self.end_pos, width=self.LINE_WIDTH
+            screen,
+            (6, 6, 8),
+            self.start_pos * scale,
+            self.end_pos * scale,
+            width=max(1, round(self.LINE_WIDTH * scale)),
         )
 
 
@@ -82,7 +88,8 @@ class _RotatingRect:
         self.rect = pygame.Rect((0, 0), self.size)
         self.rect.center = random.randrange(-WIDTH, WIDTH * 3), HEIGHT
         self.original_rect = self.rect.copy()
-        self.original_surf = pygame.transform.scale(rotat_img.copy(), self.size)
+        # copied, the outline gets drawn onto it
+        self.original_surf = scaled(rotat_img, self.size).copy()
         # pygame.draw.rect(
         #     self.original_surf,
         #     "blue",
@@ -131,28 +138,37 @@ class _RotatingRect:
 
         # self.handle_contrail(dt)
 
-    def draw(self, screen, camera: Camera):
+    def draw(self, screen, camera: Camera, scale: float = 1):
         for particle in self.particles:
             particle.draw(screen=screen)
-        screen.blit(self.surf, self.rect.topleft + pygame.Vector2(camera.vec))
+
+        pos = self.rect.topleft + pygame.Vector2(camera.vec)
+        if scale == 1:
+            screen.blit(self.surf, pos)
+        else:
+            # Rotated every frame, so there's no point in caching the result
+            screen.blit(pygame.transform.scale_by(self.surf, scale), pos * scale)
 
 
 class BackGroundEffect:
     N_LINES = 13
     LINE_PADDING = 300
     INIT_LINE = WIDTH
+    # Seconds between spawns at full quality
+    LINE_INTERVAL = 1
+    RECT_INTERVAL = 0.3
 
     def __init__(self, assets, ending: bool = False, has_easter=False) -> None:
         self.lines = []
-        self.line_gen = Time(1)
+        self.line_gen = Time(self.LINE_INTERVAL)
         self.rotating_rectangles = []
-        self.rotat_rect_gen = Time(0.3)
+        self.rotat_rect_gen = Time(self.RECT_INTERVAL)
         self.assets = assets
         if ending:
             self.rotating_img = self.assets["heart"]
         else:
             self.rotating_img = self.assets["rotating_rect"]
-        
+
         if has_easter:
             self.easter_img = self.assets["easter"]
         else:
@@ -161,6 +177,11 @@ class BackGroundEffect:
     def update(self, event_info):
         dt = event_info["dt"]
 
+        # Lower quality tiers spawn the shapes further apart
+        density = QUALITY.tier.background
+        self.line_gen.time_to_pass = self.LINE_INTERVAL / density
+        self.rotat_rect_gen.time_to_pass = self.RECT_INTERVAL / density
+
         for line in self.lines:
             line.update(dt)
 
@@ -182,14 +203,18 @@ class BackGroundEffect:
             if random.random() < 0.4 and self.easter_img is not None:
                 self.rotating_rectangles.append(_RotatingRect(self.easter_img))
 
-    def draw(self, screen, camera, current_dimension):
+    def draw(self, screen, camera, current_dimension, scale: float = 1):
+        """
+        Parameters:
+            scale: Resolution of screen relative to the game's
+        """
         screen.fill(_BACKGROUND_COLORS[current_dimension])
 
         for rect in self.rotating_rectangles:
-            rect.draw(screen, camera)
+            rect.draw(screen, camera, scale)
 
         for line in self.lines:
-            line.draw(screen)
+            line.draw(screen, scale)
 
 
 class ParallaxBackground:
@@ -226,6 +251,23 @@ class ParallaxBackground:
         if x != 0:
             screen.blit(layer, (x - width, 0))
 
+    def offsets(self, width: int, world_scroll: Tuple) -> Tuple[int, ...]:
+        """
+        Pixel offsets the layers are drawn at, the background
+        looks the same as long as they don't change
+
+        Parameters:
+                width: Width of the screen
+                world_scroll: World camera scroll
+        """
+        offsets = []
+        for _, speed in self.layers:
+            x = -world_scroll[0] * speed % width
+            # blit truncates both positions a layer is drawn at
+            offsets.append((int(x), int(x - width)))
+
+        return tuple(offsets)
+
     def draw(self, screen: pygame.Surface, world_scroll: Tuple):
         """
         Updates and draws all layers of the background
@@ -7,6 +7,8 @@ import json
 import pathlib
 import typing
 
+from game.save import SaveData
+
 # Generics
 
 EventInfo = typing.Dict[str, typing.Any]
@@ -28,4 +30,4 @@ FONT_DIR = ASSETS_DIR / "fonts"
 SETTINGS_DIR = DATA_DIR / "settings"
 
 with open(DATA_DIR / "save.json") as f:
-    SAVE_DATA = json.load(f)
+    SAVE_DATA = SaveData(json.load(f))
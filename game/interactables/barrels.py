@@ -1,21 +1,28 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
 import pygame
-from library.common import Pos 
+
 from game.interactables.abc import Interactable
+from library.common import Pos
+from library.events import EVENTS
 
 
 class EasterEgg:
     def __init__(self, img, pos) -> None:
-        self.img = img 
+        self.img = img
         self.vec = pygame.Vector2(pos)
         self.max_l = self.vec.y + 7.5, self.vec.y - 7.5
         self.going_up = True
         self.rect = self.img.get_rect(topleft=pos)
         self.picked_up = False
-    
+
     def update(self, player_rect, dt):
         if self.rect.colliderect(player_rect):
             self.picked_up = True
-            return 
+            return
 
         if self.going_up:
             if self.vec.y < self.max_l[0]:
@@ -37,20 +44,15 @@ class EasterEgg:
 class Barrel(Interactable):
     def __init__(self, imgs, pos: Pos, properties) -> None:
         super().__init__(imgs[0], imgs[1], pos)
-        self.alive = True 
-        
+        self.alive = True
+
         ###  EASTER  ###
         self.contains_easter_egg = properties.get("easter", False)
         ###   EGG    ###
 
-    def update(self, events, player_rect):
+    def update(self, player_rect):
         super().update(player_rect)
         if not self.interacting:
-            return 
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_g:
-                    self.alive = False
-
-
-
+            return
+        if EVENTS.get(pygame.KEYDOWN, key=pygame.K_g):
+            self.alive = False
@@ -10,6 +10,7 @@ import pygame
 
 from game.interactables.abc import Interactable
 from game.states.enums import Dimensions
+from library.events import EVENTS
 
 
 class Portal(Interactable):
@@ -31,12 +32,10 @@ class Portal(Interactable):
 
         # if the player is standing next to the portal
         if self.interacting:
-            for event in events["events"]:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_e:
-                        # switch to the next dimension
-                        self.dimension_change = True
-                        self.current_dimension = next(self.dimension_cycle)
+            for _ in EVENTS.get(pygame.KEYDOWN, key=pygame.K_e):
+                # switch to the next dimension
+                self.dimension_change = True
+                self.current_dimension = next(self.dimension_cycle)
 
 
 class EndPortal(Interactable):
@@ -53,8 +52,6 @@ class EndPortal(Interactable):
 
         # if the player is standing next to the portal
         if self.interacting:
-            for event in events["events"]:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_e:
-                        # switch to the next dimension
-                        self.entered = True
+            if EVENTS.get(pygame.KEYDOWN, key=pygame.K_e):
+                # switch to the next dimension
+                self.entered = True
@@ -5,8 +5,10 @@ The source code is distributed under the MIT license.
 
 import pygame
 
+from library.events import EVENTS
 from library.sfx import SFXManager as _SFXManager
 from library.ui.slider import HorizontalSlider
+from library.utils.funcs import scaled
 
 
 class SoundIcon:
@@ -17,8 +19,8 @@ class SoundIcon:
 
         slider_rect = pygame.Rect(50, 180, 60, 20)
         slider_rect.center = center_pos + pygame.Vector2(0, 20)
-        self.on_img = pygame.transform.scale(assets["sound_icon_on"], self.SIZE)
-        self.off_img = pygame.transform.scale(assets["sound_icon_off"], self.SIZE)
+        self.on_img = scaled(assets["sound_icon_on"], self.SIZE)
+        self.off_img = scaled(assets["sound_icon_off"], self.SIZE)
         self.switch = True
         self.img = self.on_img
         self.vec = pygame.Vector2(center_pos)
@@ -36,33 +38,54 @@ class SoundIcon:
         self.larger_rect.center = center_pos
 
         def handle_callback(value: int):
-            given_value = value * 4
-            total_value = slider_rect.width
-            percentage = (given_value / total_value) * 100
-            self.last_percent = percentage
-            self.sfx_manager.set_volume(percentage)
+            self.sfx_manager.set_volume(self._slider_percent(value))
 
         self.slider = HorizontalSlider(slider_rect, step=1, callback=handle_callback)
         self._handle_slider = True
 
+    def _slider_percent(self, value: int) -> float:
+        given_value = value * 4
+        total_value = self.slider_rect.width
+        percentage = (given_value / total_value) * 100
+        self.last_percent = percentage
+        return percentage
+
+    def preset(self, value: float) -> None:
+        """
+        Moves the slider to value without touching the mixer,
+        the matching volume is set once the sound manager's state is shown
+        """
+
+        def store_volume(value: int) -> None:
+            self.sfx_manager.volume = self._slider_percent(value)
+
+        callback, self.slider.callback = self.slider.callback, store_volume
+        try:
+            self.slider.value = value
+        finally:
+            self.slider.callback = callback
+
     def update(self, event_info):
         self._handle_slider = self.switch and self.larger_rect.collidepoint(
             event_info["mouse_pos"]
         )
         if self._handle_slider:
-            self.slider.update(event_info["events"])
-
-        for event in event_info["events"]:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if self.rect.collidepoint(event.pos):
-                    self.switch = not self.switch
-
-                    if self.switch:
-                        self.img = self.on_img
-                        self.sfx_manager.set_volume(self.last_percent)
-                    else:
-                        self.img = self.off_img
-                        self.sfx_manager.set_volume(0)
+            self.slider.update(
+                EVENTS.get(
+                    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION
+                )
+            )
+
+        for event in EVENTS.get(pygame.MOUSEBUTTONDOWN):
+            if self.rect.collidepoint(event.pos):
+                self.switch = not self.switch
+
+                if self.switch:
+                    self.img = self.on_img
+                    self.sfx_manager.set_volume(self.last_percent)
+                else:
+                    self.img = self.off_img
+                    self.sfx_manager.set_volume(0)
 
     def draw(self, screen):
         if self._handle_slider:
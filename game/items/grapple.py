@@ -10,7 +10,9 @@ import pygame
 
 from game.common import TILE_WIDTH
 from game.utils import get_neighboring_tiles, load_font, pixel_to_tile
+from library.events import EVENTS
 from library.particles import AngularParticle, TextParticle
+from library.perf.quality import QUALITY
 
 
 class Grapple:
@@ -108,7 +110,7 @@ class Grapple:
                     appl_player = self.camera.apply(self.player.vec)
                     appl_player_vec = pygame.Vector2(appl_player.x, appl_player.y)
 
-                    if random.random() < 0.2:
+                    if random.random() < 0.2 * QUALITY.tier.particles:
                         self.particle_manager.add(
                             AngularParticle(
                                 pos=appl_player_vec,
@@ -117,7 +119,7 @@ class Grapple:
                                 speed=0.45,
                                 shape="circle",
                                 size_reduction=0.03,
-                                glow=True,
+                                glow=QUALITY.tier.glow,
                                 lifespan=60,
                                 screen=self.screen,
                                 angle=random.uniform(
@@ -148,7 +150,7 @@ class Grapple:
 
         self.grapple_startpoint.x += self.player.SIZE[0] // 2
 
-        for event in event_info["events"]:
+        for event in EVENTS.get(pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
             if event.type == pygame.MOUSEBUTTONDOWN:
                 self.time_started_hold = pygame.time.get_ticks()
                 self.clicked = True
@@ -305,7 +307,7 @@ class Swing:
         self.grapple_startpoint = self.player.vec.copy()
         self.grappling = False
 
-        for event in event_info["events"]:
+        for event in EVENTS.get(pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
             if event.type == pygame.MOUSEBUTTONDOWN:
                 self.time_started_hold = pygame.time.get_ticks()
                 self.clicked = True
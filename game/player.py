@@ -2,16 +2,17 @@
 This file is a part of the 'Unnamed' source code.
 The source code is distributed under the MIT license.
 """
+
 import typing
 
 import pygame
-import random
 
 from game.common import SAVE_DATA, TILE_HEIGHT, TILE_WIDTH, EventInfo
 from game.entity import Entity, EntityFacing, EntityStates
-from game.items.grapple import Grapple, Swing
+from game.items.grapple import Grapple
 from game.utils import get_neighboring_tiles, load_font, pixel_to_tile
 from library.effects.explosions import ExplosionManager
+from library.events import EVENTS
 from library.particles import TextParticle
 from library.ui.healthbar import PlayerHealthBar
 from library.utils.animation import Animation
@@ -38,7 +39,7 @@ class Player(Entity):
         particle_manager,
         sfx_manager,
         has_ring=False,
-        has_easter_egg = False
+        has_easter_egg=False,
     ):
         super().__init__(settings, self.MAX_HP)
         # set player stats
@@ -64,7 +65,9 @@ class Player(Entity):
         self.jump_exp = ExplosionManager("smoke-jump")
         self.is_jump = False
 
-        self.grapple = Grapple(self, self.camera, self.particle_manager, self.sfx_manager, settings)
+        self.grapple = Grapple(
+            self, self.camera, self.particle_manager, self.sfx_manager, settings
+        )
         self.healthbar = PlayerHealthBar(self, self.particle_manager, (10, 10), 180, 15)
 
         self.has_ring = has_ring
@@ -110,14 +113,15 @@ class Player(Entity):
             self.facing = EntityFacing.LEFT
 
         self.is_jump = False
-        for event in event_info["events"]:
-            if event.type == pygame.KEYDOWN:
-                if event.key in self.SPACE_KEYS and self.touched_ground:
-                    self.is_jump = True
-                    self.vel.y = self.jump_height
-                    self.touched_ground = False
+        jump_pressed = any(
+            EVENTS.get(pygame.KEYDOWN, key=key) for key in self.SPACE_KEYS
+        )
+        if jump_pressed and self.touched_ground:
+            self.is_jump = True
+            self.vel.y = self.jump_height
+            self.touched_ground = False
 
-                    self.sfx_manager.play("jump")
+            self.sfx_manager.play("jump")
 
         # if we are in the air
         if not self.touched_ground:
@@ -177,7 +181,7 @@ class Player(Entity):
         if self.hp <= 50 and self.has_ring and self.hp - self.prev_hp < 0:
             ring.on_ground = True
             ring.rect.midbottom = SAVE_DATA["latest_checkpoint"]
-            
+
             self.particle_manager.add(
                 TextParticle(
                     screen=self.screen,
@@ -215,7 +219,6 @@ class Player(Entity):
         # GOOFY
         self.screen = screen
 
-
         self.handle_jump_exp(screen, camera)
         # self.swing.draw(screen)
         self.grapple.draw(screen)
@@ -227,7 +230,7 @@ class Player(Entity):
             animation.draw(screen, camera.apply(self.vec).topleft)
         else:
             screen.blit(animation.frames[0], camera.apply(self.vec))
-        
+
         if self.has_ring:
             screen.blit(self.ring_img, (210, 10))
         if self.has_easter_egg:
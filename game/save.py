@@ -0,0 +1,144 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
+import copy
+import json
+import logging
+import os
+import pathlib
+import sys
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger()
+
+
+class SaveData(dict):
+    """
+    Contents of the save file.
+    Remembers which fields changed since it was last written
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = set()
+        # Bumped on every change, lets work based on
+        # the data tell whether it went stale
+        self.generation = 0
+
+    def __setitem__(self, key, value):
+        # Fields rewritten with the same value every frame don't count
+        if key not in self or self[key] != value:
+            self.dirty.add(key)
+            self.generation += 1
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class SaveWriter:
+    """
+    Writes the save file on a background thread.
+    Saves requested while a write is still pending are coalesced into
+    a single write of the newest data, and the file is replaced
+    atomically so a crash mid-write can't corrupt it
+    """
+
+    def __init__(
+        self,
+        data: SaveData,
+        path: pathlib.Path,
+        defer: Optional[Callable[[Callable], None]] = None,
+    ):
+        """
+        Parameters:
+            data: The save data to write
+            path: Path of the save file
+            defer: Queues a callable to run later on the main thread,
+                used to write where there are no threads
+        """
+        self.data = data
+        self.path = path
+        self.defer = defer
+
+        self._pending: Optional[dict] = None
+        self._writing = False
+        self._condition = threading.Condition()
+
+        # The browser build has no threads, it writes on the main thread
+        # in idle frame time instead
+        self._threaded = sys.platform != "emscripten"
+        if self._threaded:
+            threading.Thread(target=self._run, name="save", daemon=True).start()
+
+    def save(self) -> None:
+        """
+        Queues a write of the save data, if any field changed since the last one
+        """
+        if not self.data.dirty:
+            return
+
+        logger.info(f"Saving {', '.join(sorted(self.data.dirty))}")
+        snapshot = copy.deepcopy(dict(self.data))
+        self.data.dirty.clear()
+
+        if not self._threaded:
+            pending, self._pending = self._pending, snapshot
+            if self.defer is None:
+                self._write_pending()
+            elif pending is None:
+                self.defer(self._write_pending)
+            return
+
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued write is on disk
+        """
+        if not self._threaded:
+            self._write_pending()
+            return
+
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+
+            try:
+                self._write(snapshot)
+            except OSError:
+                logger.exception(f"Couldn't write {self.path}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write_pending(self) -> None:
+        snapshot, self._pending = self._pending, None
+        if snapshot is not None:
+            self._write(snapshot)
+
+    def _write(self, snapshot: dict) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, self.path)
@@ -1,11 +1,15 @@
-from cgi import test
-import re
-import pygame
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
 import math
-from library.utils.funcs import get_movement, circle_surf
-from library.utils.classes import Time 
+
+import pygame
+
 from library.common import Pos
-from library.effects.explosions import ExplosionManager
+from library.utils.classes import Time
+from library.utils.funcs import circle_surf, get_movement, rotated
 
 
 class _Bullet:
@@ -18,7 +22,7 @@ class _Bullet:
             angle: angle in radians
         """
         self.img = circle_surf(self.SIZE, (100, 98, 25))
-        self.angle = angle 
+        self.angle = angle
         self.dx, self.dy = get_movement(angle, speed)
         self.vec = pygame.Vector2(pos)
         self.rect = self.img.get_rect()
@@ -27,15 +31,16 @@ class _Bullet:
         self.max_dist = max_dist
 
     def update(self, dt):
-        self.vec.x += self.dx * dt 
-        self.vec.y += self.dy * dt 
-        self.distance_covered += math.sqrt(((self.dx * dt) ** 2) + ((self.dy * dt) ** 2))
+        self.vec.x += self.dx * dt
+        self.vec.y += self.dy * dt
+        self.distance_covered += math.sqrt(
+            ((self.dx * dt) ** 2) + ((self.dy * dt) ** 2)
+        )
         self.rect.center = self.vec
-        
+
         if self.distance_covered > self.max_dist:
             self.alive = False
 
-
     def draw(self, screen, camera):
         screen.blit(self.img, camera.apply(self.vec))
 
@@ -44,10 +49,10 @@ class Shooter:
     BULLET_SPEED = 5.3
 
     def __init__(self, image: pygame.Surface, obj, sfx_manager) -> None:
-        self.obj = obj 
+        self.obj = obj
         self.angle = obj.properties["angle"]
-        self.image = pygame.transform.rotate(image,
-        obj.properties["angle"])
+        # turrets facing the same way share one rotated image
+        self.image = rotated(image, obj.properties["angle"])
         self.pos = (obj.x, obj.y)
         self.rect = self.image.get_bounding_rect()
         self.rect.topleft = self.pos
@@ -61,7 +66,7 @@ class Shooter:
             self.damage = obj.damage
         except AttributeError:
             self.damage = False
-    
+
     def update(self, player, dt):
         test_value = [0, 0, 0]
         if self.bullet_gen_time.update():
@@ -70,13 +75,12 @@ class Shooter:
                     self.rect.center,
                     -math.radians(self.angle),
                     self.BULLET_SPEED,
-                    max_dist=self.obj.properties["max_dist"]
+                    max_dist=self.obj.properties["max_dist"],
                 )
             )
 
-            if pygame.Vector2(self.rect.topleft).distance_to(player.vec) < 15 * 16:
-                self.sfx_manager.play("turret_shoot")
-        
+            self.sfx_manager.play("turret_shoot", self.rect.center)
+
         if player.rect.colliderect(self.rect) and not player.touched_ground:
             self.alive = False
             test_value[2] = self.pos
@@ -91,15 +95,11 @@ class Shooter:
             if not bullet.alive:
                 test_value[1] = bullet.vec
                 self.bullets.remove(bullet)
-        
-        
+
         return test_value
-            
 
     def draw(self, screen, camera):
         for bullet in self.bullets:
             bullet.draw(screen, camera)
 
         screen.blit(self.image, camera.apply(self.rect))
-
-
@@ -1,3 +1,8 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
 from typing import Optional
 
 import pygame
@@ -5,10 +10,12 @@ import pygame
 from game.common import ASSETS_DIR, HEIGHT, WIDTH, EventInfo
 from game.states.enums import States
 from game.utils import load_font
-
+from library.render import DirtyRegions
+from library.sprite.load import load_image
 from library.transition import FadeTransition
 from library.ui.buttons import Button
 from library.ui.camera import Camera
+from library.utils.funcs import scaled
 
 
 class InitCreditStage:
@@ -38,21 +45,54 @@ class InitCreditStage:
             corner_radius=4,
         )
 
-        self.pygame_powered = pygame.transform.scale(pygame.image.load(ASSETS_DIR / "images/credits/pygame_powered.png").convert_alpha(), (270, 105))
+        self.pygame_powered = scaled(
+            load_image(ASSETS_DIR / "images/credits/pygame_powered.png"), (270, 105)
+        )
+
+        # (surface, center in the scrolled credits), rendered once
+        self.items = [
+            (self.render_txt("Credit to:", self.TITLE_FONT), (0, 0)),
+            (
+                self.render_txt(
+                    "Developers: Axis#3719, disappointment#8603, SSS_Says_Snek#0194",
+                    self.MAIN_FONT,
+                ),
+                (0, 150),
+            ),
+            (
+                self.render_txt(
+                    "Art mainly done by disappointment, and partly by Axis",
+                    self.MAIN_FONT,
+                ),
+                (0, 250),
+            ),
+            (self.pygame_powered, (0, 350)),
+        ]
+
+    @staticmethod
+    def render_txt(txt, font):
+        return font.render(txt, True, (255, 255, 255))
+
 
 class Credits(InitCreditStage):
-    def render_center_txt(self, screen, txt, center_pos, font):
-        txt_surf = font.render(txt, True, (255, 255, 255))
+    def __init__(self, switch_info: dict):
+        super().__init__(switch_info)
+        # Only what changed gets redrawn and presented
+        self.regions = DirtyRegions((WIDTH, HEIGHT))
+        self.dirty_rects = None
 
-        e = self.camera.hard_apply(center_pos)
-        f = pygame.Vector2(e.x, e.y)
+    def layout(self):
+        """
+        Where the credits items are drawn this frame
+        """
+        rects = []
+        for surf, center_pos in self.items:
+            e = self.camera.hard_apply(center_pos)
+            f = pygame.Vector2(e.x, e.y)
 
-        txt_rect = txt_surf.get_rect(center=f)
+            rects.append(surf.get_rect(center=f))
 
-        screen.blit(
-            txt_surf,
-            txt_rect
-        )
+        return rects
 
     def update(self, event_info: EventInfo):
         self.camera.hard_adjust_to(pygame.Vector2(0, self.yscroll))
@@ -67,24 +107,28 @@ class Credits(InitCreditStage):
         if self.transition.event:
             self.next_state = States.MAIN_MENU
         # print(self.camera.camera)
-    
+
     def draw(self, screen):
+        rects = self.layout()
+        for index, rect in enumerate(rects):
+            self.regions.track(index, rect)
+        self.regions.track("skip", self.skip_button.rect, self.skip_button.state)
+
+        # Fading repaints the whole screen, until it's fully faded in
+        self.regions.track(
+            "transition", screen.get_rect(), self.transition.image.get_alpha()
+        )
+
+        self.dirty_rects = self.regions.draw(
+            screen, lambda surf: self.draw_items(surf, rects)
+        )
 
+    def draw_items(self, screen, rects):
         screen.fill((0, 0, 0))
 
         self.skip_button.draw(screen)
-        
-        self.render_center_txt(screen, "Credit to:", (0, 0), self.TITLE_FONT)
 
-        self.render_center_txt(screen, "Developers: Axis#3719, disappointment#8603, SSS_Says_Snek#0194", (0, 150), self.MAIN_FONT)
-        self.render_center_txt(screen, "Art mainly done by disappointment, and partly by Axis", (0, 250), self.MAIN_FONT)
-
-        e = self.camera.hard_apply((0, 350))
-        f = pygame.Vector2(e.x, e.y)
-
-        screen.blit(
-            self.pygame_powered,
-            self.pygame_powered.get_rect(center=f)
-        )
+        for (surf, _), rect in zip(self.items, rects):
+            screen.blit(surf, rect)
 
-        self.transition.draw(screen)
\ No newline at end of file
+        self.transition.draw(screen)
@@ -29,3 +29,30 @@ class Dimensions(enum.Enum):
     WATER_DIMENSION = "water_dimension"
     MOON_DIMENSION = "moon_dimension"
     HOMELAND_DIMENSION = "homeland_dimension"
+
+
+class Layers(enum.IntEnum):
+    """
+    Draw order of a level, lowest first
+    """
+
+    BACKGROUND = 0
+    CHECKPOINTS = enum.auto()
+    PORTALS = enum.auto()
+    NOTES = enum.auto()
+    BARRELS = enum.auto()
+    ENEMIES = enum.auto()
+    SHOOTERS = enum.auto()
+    WIFE = enum.auto()
+    MAP = enum.auto()
+    RING = enum.auto()
+    PLAYER = enum.auto()
+    SPIKES = enum.auto()
+    EASTER_EGG = enum.auto()
+    UI = enum.auto()
+    PARTICLES = enum.auto()
+    NOTE_TEXT = enum.auto()
+    SOUND_ICON = enum.auto()
+    EXPLOSIONS = enum.auto()
+    PAUSE_MENU = enum.auto()
+    TRANSITION = enum.auto()
@@ -9,10 +9,12 @@ import pygame
 
 from game.common import HEIGHT, WIDTH, EventInfo
 from game.states.enums import States
+from library.render import DirtyRegions
 from library.sfx import SFXManager
 from library.sprite.load import load_assets
 from library.transition import FadeTransition
 from library.ui.buttons import Button
+from library.utils.funcs import scaled
 
 pygame.mixer.init()
 
@@ -24,9 +26,17 @@ class InitDialogueStage:
         self.switch_info = switch_info
 
         self.assets = load_assets("intro")
+        # The metadata scales the frames to the screen size when they're
+        # decoded, so this only kicks in if the two don't match anymore
         self.frames = [
-            pygame.transform.scale(self.assets[f"frame_{n}"], (WIDTH, HEIGHT))
-            for n in range(1, len(self.assets) + 1)
+            (
+                frame
+                if frame.get_size() == (WIDTH, HEIGHT)
+                else scaled(frame, (WIDTH, HEIGHT))
+            )
+            for frame in (
+                self.assets[f"frame_{n}"] for n in range(1, len(self.assets) + 1)
+            )
         ]
         self.current_frame_index = 0
         self.frame_cooldown = self.FRAME_COOLDOWN
@@ -37,6 +47,8 @@ class InitDialogueStage:
         self.transition = FadeTransition(True, self.FADE_SPEED, (WIDTH, HEIGHT))
 
         self.next_state: Optional[States] = None
+        # The level is built in the background while the intro plays
+        self.upcoming_state = States.LEVEL
 
 
 class FrameDialogueStage(InitDialogueStage):
@@ -113,8 +125,29 @@ class TransitionDialogueStage(ButtonDialogueStage):
 
 
 class Dialogue(TransitionDialogueStage):
+    def __init__(self, switch_info: dict):
+        super().__init__(switch_info)
+        # Only what changed gets redrawn and presented
+        self.regions = DirtyRegions((WIDTH, HEIGHT))
+        self.dirty_rects = None
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the screen changes, a frame shown
+        without a transition stays the same
+        """
+        return self.switching or self.transition.image.get_alpha() > 0
+
     def update(self, event_info: EventInfo):
         super().update(event_info)
 
     def draw(self, screen: pygame.Surface):
-        super().draw(screen)
+        self.regions.track("frame", screen.get_rect(), self.current_frame_index)
+        self.regions.track("skip", self.skip_button.rect, self.skip_button.state)
+        # Fading repaints the whole screen, until it's fully faded in
+        self.regions.track(
+            "transition", screen.get_rect(), self.transition.image.get_alpha()
+        )
+
+        self.dirty_rects = self.regions.draw(screen, super().draw)
@@ -4,16 +4,14 @@ The source code is distributed under the MIT license.
 """
 
 import abc
-from calendar import day_abbr
-from dataclasses import dataclass
 import logging
 from typing import Optional
 
 import pygame
 
 from game.background import BackGroundEffect
-from game.common import (ASSETS_DIR, HEIGHT, MAP_DIR, SAVE_DATA, SETTINGS_DIR, WIDTH,
-                         EventInfo)
+from game.common import (ASSETS_DIR, HEIGHT, MAP_DIR, SAVE_DATA, SETTINGS_DIR,
+                         WIDTH, EventInfo)
 from game.enemy import MovingPlatform, MovingWall, Ungrappleable
 from game.interactables.barrels import Barrel, EasterEgg
 from game.interactables.checkpoint import Checkpoint
@@ -23,18 +21,26 @@ from game.interactables.ring import Ring
 from game.interactables.sound_icon import SoundIcon
 from game.player import Player
 from game.shooter import Shooter
-from game.states.enums import Dimensions, States
+from game.states.enums import Dimensions, Layers, States
 from game.utils import load_font, load_settings
 from library.effects import ExplosionManager
+from library.events import EVENTS
 from library.particles import ParticleManager, TextParticle
+from library.registry import ASSETS
+from library.render import DrawBuffer
+from library.scheduler import SCHEDULER
 from library.sfx import SFXManager
-from library.sprite.load import load_assets
+from library.sprite.load import (load_asset, load_assets, load_image,
+                                 prefetch_asset)
+from library.systems import DRAW, UPDATE, SystemScheduler
 from library.tilemap import TileLayerMap
 from library.tiles import SpikeTile
 from library.transition import FadeTransition
 from library.ui.buttons import Button
 from library.ui.camera import Camera
 from library.ui.healthbar import PlayerHealthBar
+from library.utils.classes import LazyDict
+from library.utils.funcs import scaled
 
 logger = logging.getLogger()
 
@@ -42,35 +48,71 @@ logger = logging.getLogger()
 class InitLevelStage(abc.ABC):
     def __init__(self, switch_info: dict) -> None:
         """
-        Initialize some attributes
+        Initialize the world data that stays the same across respawns
         """
 
-        self.switch_info = {}
         self.switch_info = switch_info
-        self.current_dimension = Dimensions(
-            SAVE_DATA["latest_dimension"]
-        )  # First parallel dimension
-        self.latest_checkpoint = SAVE_DATA["latest_checkpoint"]
+        self.ending = "ending" in switch_info
 
         self.camera = Camera(WIDTH, HEIGHT)
+        # Stages queue what they draw, Level flushes it in layer order.
+        # Everything under the UI is world, it may be drawn at a lower resolution
+        self.draw_buffer = DrawBuffer((WIDTH, HEIGHT), world_below=Layers.UI)
         self.sfx_manager = SFXManager("level")
+        self.sfx_manager.listener = self.camera
         self.assets = load_assets("level")
-        self.event_info = {"dt": 0}
+        # Lease the level was built in, for assets loaded later on
+        self.asset_lease = ASSETS.current_lease()
 
-        if "ending" in switch_info:
+        if self.ending:
             self.tilemap = TileLayerMap(MAP_DIR / "ending.tmx")
         else:
             self.tilemap = TileLayerMap(MAP_DIR / "dimension_one.tmx")
 
+        # Loaded once a dimension is first used or unlocked
+        self.settings = LazyDict(
+            lambda name: load_settings(SETTINGS_DIR / f"{name}.json")
+        )
+        self.prefetched_dimensions = set()
+
+        self.spikes = set()
+        self.particle_manager = ParticleManager(self.camera)
+
+        self.ring_img = load_image(ASSETS_DIR / "images/ring.png")
+        self.easter_egg_img = scaled(
+            load_image(ASSETS_DIR / "images/easter.png"), (16, 16)
+        )
+
+        self.explosion_manager = ExplosionManager("fire")
+        self.turret_explosioner = ExplosionManager("turret")
+
+    def can_reset(self, switch_info: dict) -> bool:
+        """
+        Whether switching to a level with the given switch info
+        can be done in place, i.e. it would load the same map
+
+        Parameters:
+            switch_info: Switch info the next level would be created with
+        """
+        return ("ending" in switch_info) == self.ending
+
+    def reset(self, checkpoint) -> None:
+        """
+        (Re)build the mutable entity state, keeping the loaded map,
+        assets, sounds and settings
+
+        Parameters:
+            checkpoint: Position to spawn the player at
+        """
+        self.current_dimension = Dimensions(
+            SAVE_DATA["latest_dimension"]
+        )  # First parallel dimension
+        self.latest_checkpoint = checkpoint
+        self.event_info = {"dt": 0}
 
         self.transition = FadeTransition(True, self.FADE_SPEED, (WIDTH, HEIGHT))
         self.next_state: Optional[States] = None
 
-        self.settings = {
-            enm.value: load_settings(SETTINGS_DIR / f"{enm.value}.json")
-            for enm in Dimensions
-        }
-
         self.unlocked_dimensions = [
             Dimensions.PARALLEL_DIMENSION,
             Dimensions.VOLCANIC_DIMENSION,
@@ -80,25 +122,39 @@ class InitLevelStage(abc.ABC):
         self.enemies = set()
         self.portals = set()
         self.notes = set()
-        self.spikes = set()
         self.barrels = set()
-        self.particle_manager = ParticleManager(self.camera)
+        self.particle_manager.clear()
+        self.explosion_manager.explosions.clear()
+        self.turret_explosioner.explosions.clear()
         self.paused = False
 
         self.latest_checkpoint_id = SAVE_DATA["latest_checkpoint_id"]
 
         self.checkpoints = {
             Checkpoint(
-                pygame.Rect(obj.x, obj.y, obj.width, obj.height), self.particle_manager, obj.unlock_dimension, obj.c_id
+                pygame.Rect(obj.x, obj.y, obj.width, obj.height),
+                self.particle_manager,
+                obj.unlock_dimension,
+                obj.c_id,
             )
             for obj in self.tilemap.tilemap.get_layer_by_name("checkpoints")
         }
 
         try:
-            self.ring = [Ring(pygame.image.load(ASSETS_DIR / "images/ring.png"), (obj.x, obj.y), self.particle_manager, self.sfx_manager) for obj in self.tilemap.tilemap.get_layer_by_name("ring")][0]
+            self.ring = [
+                Ring(
+                    self.ring_img,
+                    (obj.x, obj.y),
+                    self.particle_manager,
+                    self.sfx_manager,
+                )
+                for obj in self.tilemap.tilemap.get_layer_by_name("ring")
+            ][0]
         except IndexError:
-            self.ring = Ring(pygame.image.load(ASSETS_DIR / "images/ring.png"), (0, 0), self.particle_manager, self.sfx_manager)
-        
+            self.ring = Ring(
+                self.ring_img, (0, 0), self.particle_manager, self.sfx_manager
+            )
+
         self.ring.on_ground = not SAVE_DATA["has_ring"]
 
         self.num_extra_dims_unlocked = SAVE_DATA["num_extra_dims_unlocked"]
@@ -109,64 +165,73 @@ class InitLevelStage(abc.ABC):
                     Portal(portal_obj, self.unlocked_dimensions, self.assets["portal"])
                 )
             elif portal_obj.name == "end":
-                self.portals.add(
-                    EndPortal(portal_obj, self.assets["portal"])
-                )
+                self.portals.add(EndPortal(portal_obj, self.assets["portal"]))
 
         len_unlocked_dims = len(self.unlocked_dimensions)
-        for dimension in list(Dimensions)[len_unlocked_dims:len_unlocked_dims + self.num_extra_dims_unlocked]:
+        for dimension in list(Dimensions)[
+            len_unlocked_dims : len_unlocked_dims + self.num_extra_dims_unlocked
+        ]:
             self.unlocked_dimensions.append(dimension)
 
         self.player = Player(
             self.settings[self.current_dimension.value],
-            (0, 0) if "ending" in switch_info else self.latest_checkpoint,
+            (0, 0) if self.ending else checkpoint,
             self.assets["dave_walk"],
             self.camera,
             self.particle_manager,
             self.sfx_manager,
             SAVE_DATA["has_ring"],
-            SAVE_DATA["has_easter_egg"]
+            SAVE_DATA["has_easter_egg"],
         )
         self.player.ring_img = self.ring.non_interacting_img
-        self.player.easter_egg_img = pygame.transform.scale(pygame.image.load(ASSETS_DIR / "images/easter.png").convert_alpha(), (16, 16))
+        self.player.easter_egg_img = self.easter_egg_img
 
-        self.explosion_manager = ExplosionManager("fire")
-        self.turret_explosioner = ExplosionManager("turret")
+        # The current dimension is loaded right away
+        self.prefetched_dimensions.add(self.current_dimension)
+        for dimension in self.unlocked_dimensions:
+            self.prefetch_dimension(dimension)
 
-        self.paused = False
-
-    def update(*args, **kwargs):
-        pass
+    def prefetch_dimension(self, dimension: Dimensions) -> None:
+        """
+        Loads a dimension's settings and tileset in the background,
+        so travelling to it doesn't stall
+        """
+        if dimension in self.prefetched_dimensions:
+            return
 
-    def draw(*args, **kwargs):
-        pass
+        self.prefetched_dimensions.add(dimension)
+        SCHEDULER.add(lambda: self.settings[dimension.value])
+        prefetch_asset("level", dimension.value, self.asset_lease)
 
 
 class RenderBackgroundStage(InitLevelStage):
-    def __init__(self, switch_info: dict) -> None:
-        super().__init__(switch_info)
-        print("ending" in self.switch_info)
-        self.background_manager = BackGroundEffect(self.assets, "ending" in self.switch_info, self.player.has_easter_egg)
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
+        self.background_manager = BackGroundEffect(
+            self.assets, self.ending, self.player.has_easter_egg
+        )
 
-    def update(self):
+    def update_background(self, event_info: EventInfo):
         self.background_manager.update(self.event_info)
 
-    def draw(self, screen):
-        self.background_manager.draw(screen, self.camera, self.current_dimension)
+    def draw_background(self, screen):
+        with self.draw_buffer.layer(Layers.BACKGROUND):
+            self.draw_buffer.call(
+                lambda surf, scale: self.background_manager.draw(
+                    surf, self.camera, self.current_dimension, scale
+                ),
+                scalable=True,
+            )
 
 
 class RenderCheckpointStage(RenderBackgroundStage):
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-
+    def draw_checkpoints(self, screen: pygame.Surface):
         for checkpoint in self.checkpoints:
             checkpoint.draw(screen)
 
 
 class RenderPortalStage(RenderCheckpointStage):
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-
+    def draw_portals(self, screen: pygame.Surface):
         for portal in self.portals:
             if portal.dimension_change:
                 font = load_font(8)
@@ -191,7 +256,7 @@ class RenderPortalStage(RenderCheckpointStage):
                     )
                 else:
                     self.particle_manager.add(text_particle)
-            
+
             if portal.name == "end" and portal.entered and not self.player.has_ring:
                 self.particle_manager.add(
                     TextParticle(
@@ -207,47 +272,48 @@ class RenderPortalStage(RenderCheckpointStage):
                 )
                 portal.entered = False
 
-            portal.draw(screen, self.camera)
+            with self.draw_buffer.layer(Layers.PORTALS):
+                portal.draw(self.draw_buffer, self.camera)
 
 
 class RenderNoteStage(RenderPortalStage):
-    def draw(self, screen):
-        super().draw(screen)
-        for note in self.notes:
-            note.draw(screen, self.camera)
+    def draw_notes(self, screen):
+        with self.draw_buffer.layer(Layers.NOTES):
+            for note in self.notes:
+                note.draw(self.draw_buffer, self.camera)
+
 
 class RenderBarrelStage(RenderNoteStage):
-    def draw(self, screen):
-        super().draw(screen)
-        for barrel in self.barrels:
-            barrel.draw(screen, self.camera) 
-        
+    def draw_barrels(self, screen):
+        with self.draw_buffer.layer(Layers.BARRELS):
+            for barrel in self.barrels:
+                barrel.draw(self.draw_buffer, self.camera)
+
+
 class RenderEnemyStage(RenderBarrelStage):
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-        for enemy in self.enemies:
-            if enemy.name == "ungrappleable":
-                continue
+    def draw_enemies(self, screen: pygame.Surface):
+        with self.draw_buffer.layer(Layers.ENEMIES):
+            for enemy in self.enemies:
+                if enemy.name == "ungrappleable":
+                    continue
 
-            enemy.draw(self.event_info["dt"], screen, self.camera)
+                enemy.draw(self.event_info["dt"], self.draw_buffer, self.camera)
 
 
 class ShooterStage(RenderEnemyStage):
-    def __init__(self, switch_info: dict) -> None:
-        super().__init__(switch_info)
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
         self.shooters = {
             Shooter(self.assets["shooter"], obj, self.sfx_manager)
             for obj in self.tilemap.tilemap.get_layer_by_name("shooters")
         }
 
-    def update(self) -> None:
-        super().update()
-
+    def update_shooters(self, event_info: EventInfo) -> None:
         for shooter in set(self.shooters):
             dm, vec, pos = shooter.update(self.player, self.event_info["dt"])
             if vec:
                 self.explosion_manager.create_explosion(self.camera.apply(vec).topleft)
-            
+
             if dm:
                 self.player.hp -= dm
 
@@ -257,12 +323,10 @@ class ShooterStage(RenderEnemyStage):
             if not shooter.alive:
                 self.shooters.remove(shooter)
 
-    def draw(self, screen: pygame.Surface) -> None:
-        super().draw(screen)
-
-        for shooter in self.shooters:
-            shooter.draw(screen, self.camera)
-
+    def draw_shooters(self, screen: pygame.Surface) -> None:
+        with self.draw_buffer.layer(Layers.SHOOTERS):
+            for shooter in self.shooters:
+                shooter.draw(self.draw_buffer, self.camera)
 
 
 class OptionalStageWife(ShooterStage):
@@ -272,29 +336,25 @@ class OptionalStageWife(ShooterStage):
 
         class Wife:
             def __init__(self, pos, img) -> None:
-                self.pos = pos 
+                self.pos = pos
                 self.img = img
 
-        if "ending" not in self.switch_info:
-            return 
-
-        self.wife = [Wife((obj.x, obj.y), self.assets["wife"]) for obj in 
-        self.tilemap.tilemap.get_layer_by_name("wife")][0]
-
-
-    def update(self) -> None:
-        super().update()
         if "ending" not in self.switch_info:
             return
-        
 
-    def draw(self, screen):
-        super().draw(screen)
-        if "ending" in self.switch_info:
-            try:
-                screen.blit(self.assets["wife"], self.camera.apply(self.wife.pos))
-            except AttributeError:
-                pass
+        self.wife = [
+            Wife((obj.x, obj.y), self.assets["wife"])
+            for obj in self.tilemap.tilemap.get_layer_by_name("wife")
+        ][0]
+
+    def draw_wife(self, screen):
+        try:
+            with self.draw_buffer.layer(Layers.WIFE):
+                self.draw_buffer.blit(
+                    self.assets["wife"], self.camera.apply(self.wife.pos)
+                )
+        except AttributeError:
+            pass
 
 
 class TileStage(OptionalStageWife):
@@ -306,9 +366,31 @@ class TileStage(OptionalStageWife):
         super().__init__(switch_info)
         # self.tilemap = TileLayerMap(MAP_DIR / f"{self.current_dimension.value}.tmx"
 
-        self.tilesets = {enm: self.assets[enm.value] for enm in Dimensions}
+        self.tilesets = LazyDict(
+            lambda enm: load_asset("level", enm.value, self.asset_lease)
+        )
+
+        # Dimension the map surface was last baked with
+        self.map_dimension = None
+
+        for spike_obj in self.tilemap.tilemap.get_layer_by_name("spikes"):
+            if spike_obj.name == "spike":
+                self.spikes.add(SpikeTile(self.assets["spike"], spike_obj))
+
+    def bake_map(self) -> None:
+        """
+        Renders the map with the current dimension's tileset,
+        unless it was already baked with it
+        """
+        if self.map_dimension == self.current_dimension:
+            return
 
         self.map_surf = self.tilemap.make_map(self.tilesets[self.current_dimension])
+        self.map_dimension = self.current_dimension
+
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
+        self.bake_map()
 
         for enemy_obj in self.tilemap.tilemap.get_layer_by_name("enemies"):
             if enemy_obj.name == "moving_wall":
@@ -328,19 +410,11 @@ class TileStage(OptionalStageWife):
                     )
                 )
             elif enemy_obj.name == "ungrappleable":
-                self.enemies.add(
-                    Ungrappleable(
-                        enemy_obj
-                    )
-                )
+                self.enemies.add(Ungrappleable(enemy_obj))
 
-        for spike_obj in self.tilemap.tilemap.get_layer_by_name("spikes"):
-            if spike_obj.name == "spike":
-                self.spikes.add(SpikeTile(self.assets["spike"], spike_obj))
-
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-        screen.blit(self.map_surf, self.camera.apply((0, 0)))
+    def draw_map(self, screen: pygame.Surface):
+        with self.draw_buffer.layer(Layers.MAP):
+            self.draw_buffer.blit(self.map_surf, self.camera.apply((0, 0)))
 
 
 class PlayerStage(TileStage):
@@ -355,9 +429,7 @@ class PlayerStage(TileStage):
         #     self.settings[self.current_dimension.value], self.assets["dave_walk"]
         # )
 
-    def update(self, event_info: EventInfo):
-        super().update()
-
+    def update_player(self, event_info: EventInfo):
         self.ring.update(self.player.rect, self.player)
 
         self.player.update(event_info, self.tilemap, self.enemies, self.ring)
@@ -367,46 +439,34 @@ class PlayerStage(TileStage):
         if self.player.y > 2500:
             self.player.alive = False
 
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-
-        self.ring.draw(screen, self.camera)
-
-        self.player.draw(screen, self.camera)
+    def draw_player(self, screen: pygame.Surface):
+        # Both hold on to the screen for the particles they spawn
+        with self.draw_buffer.layer(Layers.RING):
+            self.draw_buffer.call(lambda surf: self.ring.draw(surf, self.camera))
+        with self.draw_buffer.layer(Layers.PLAYER):
+            self.draw_buffer.call(lambda surf: self.player.draw(surf, self.camera))
 
 
 class ItemStage(PlayerStage):
     def __init__(self, switch_info: dict) -> None:
         super().__init__(switch_info)
 
-    def draw(self, screen):
-        super().draw(screen)
-        # self.grapple.draw(screen)
-
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-        # self.grapple.update(event_info, self.tilemap, self.enemies)
-
 
 class SpecialTileStage(ItemStage):
     def __init__(self, switch_info: dict) -> None:
         super().__init__(switch_info)
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-
+    def update_special_tiles(self, event_info: EventInfo):
         for special_tiles in self.tilemap.special_tiles.values():
             special_tiles.update(self.player)
 
 
 class EnemyStage(SpecialTileStage):
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-
+    def update_enemies(self, event_info: EventInfo):
         for enemy in self.enemies:
             if enemy.name == "ungrappleable":
                 continue
-            
+
             if enemy.name == "moving_platform":
                 enemy.update(event_info, self.tilemap, self.player, self.shooters)
             else:
@@ -414,40 +474,39 @@ class EnemyStage(SpecialTileStage):
 
 
 class SpikeStage(EnemyStage):
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-
+    def update_spikes(self, event_info: EventInfo):
         for spike in self.spikes:
             spike.update(self.player)
 
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-
-        for spike in self.spikes:
-            spike.draw(screen, self.camera)
+    def draw_spikes(self, screen: pygame.Surface):
+        with self.draw_buffer.layer(Layers.SPIKES):
+            for spike in self.spikes:
+                spike.draw(self.draw_buffer, self.camera)
 
 
 class CheckpointStage(SpikeStage):
     def __init__(self, switch_info: dict) -> None:
         super().__init__(switch_info)
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-
+    def update_checkpoints(self, event_info: EventInfo):
         latest_checkpoint_id_cp = self.latest_checkpoint_id
 
         for checkpoint in self.checkpoints:
 
-            if not checkpoint.text_spawned and checkpoint.rect.colliderect(
-                self.player.rect
-            ) and (checkpoint.id > self.latest_checkpoint_id or checkpoint.id == 0):
-                self.latest_checkpoint = checkpoint.rect.midbottom
+            if (
+                not checkpoint.text_spawned
+                and checkpoint.rect.colliderect(self.player.rect)
+                and (checkpoint.id > self.latest_checkpoint_id or checkpoint.id == 0)
+            ):
+                # Stored as a list, how it comes back from the save file,
+                # so the save isn't seen as changed every time
+                self.latest_checkpoint = list(checkpoint.rect.midbottom)
                 SAVE_DATA["latest_checkpoint"] = self.latest_checkpoint
 
                 self.latest_checkpoint_id = checkpoint.id
                 SAVE_DATA["latest_checkpoint_id"] = self.latest_checkpoint_id
 
-                if checkpoint.unlock_dimension:       
+                if checkpoint.unlock_dimension:
                     try:
                         self.unlocked_dimensions.append(
                             list(Dimensions)[len(self.unlocked_dimensions)]
@@ -456,12 +515,13 @@ class CheckpointStage(SpikeStage):
                         continue
 
                     SAVE_DATA["num_extra_dims_unlocked"] += 1
+                    self.prefetch_dimension(self.unlocked_dimensions[-1])
 
                     for portal in self.portals:
                         if portal.name == "end":
                             continue
                         portal.unlock_dimension(self.unlocked_dimensions)
-                
+
                 self.sfx_manager.play("checkpoint")
 
                 self.player.hp = 100
@@ -470,15 +530,14 @@ class CheckpointStage(SpikeStage):
 
 
 class NoteStage(CheckpointStage):
-    def __init__(self, switch_info: dict) -> None:
-        super().__init__(switch_info)
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
         self.notes = {
             Note(self.assets["note"], (obj.x, obj.y), obj.properties["text"])
             for obj in self.tilemap.tilemap.get_layer_by_name("notes")
         }
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
+    def update_notes(self, event_info: EventInfo):
         for note in self.notes:
             note.update(event_info, self.player.rect)
 
@@ -493,9 +552,7 @@ class PortalStage(NoteStage):
                     Portal(portal_obj, self.unlocked_dimensions, self.assets["portal"])
                 )"""
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
-
+    def update_portals(self, event_info: EventInfo):
         for portal in self.portals:
             # if we aren't changing the dimension,
             # we have to reset portal's dimension to the current one
@@ -508,9 +565,7 @@ class PortalStage(NoteStage):
                 logger.info(f"Changed dimension to: {portal.current_dimension}")
 
                 self.current_dimension = portal.current_dimension
-                self.map_surf = self.tilemap.make_map(
-                    self.tilesets[self.current_dimension]
-                )
+                self.bake_map()
 
                 # change player's settings
                 self.player.change_settings(self.settings[self.current_dimension.value])
@@ -535,39 +590,42 @@ class PortalStage(NoteStage):
                 SAVE_DATA["latest_dimension"] = Dimensions.HOMELAND_DIMENSION.value
 
         # Unlocking dimensions
-        for event in event_info["events"]:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_5:
-                    for dimension in Dimensions:
-                        if dimension not in self.unlocked_dimensions:
-                            self.unlocked_dimensions.append(dimension)
-                            break
+        for _ in EVENTS.get(pygame.KEYDOWN, key=pygame.K_5):
+            for dimension in Dimensions:
+                if dimension not in self.unlocked_dimensions:
+                    self.unlocked_dimensions.append(dimension)
+                    self.prefetch_dimension(dimension)
+                    break
+
+            for portal in self.portals:
+                if portal.name == "end":
+                    continue
+                portal.unlock_dimension(self.unlocked_dimensions)
 
-                    for portal in self.portals:
-                        if portal.name == "end":
-                            continue
-                        portal.unlock_dimension(self.unlocked_dimensions)
-            
 
 class BarrelStage(PortalStage):
-    def __init__(self, switch_info: dict) -> None:
-        super().__init__(switch_info)
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
         self.barrels = {
             Barrel(self.assets["barrel"], (obj.x, obj.y), obj.properties)
             for obj in self.tilemap.tilemap.get_layer_by_name("barrels")
         }
         self.easter_egg = None
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
+    def update_barrels(self, event_info: EventInfo):
         for barrel in set(self.barrels):
-            barrel.update(event_info["events"], self.player.rect)
+            barrel.update(self.player.rect)
 
             if not barrel.alive:
                 if barrel.contains_easter_egg:
-                    self.easter_egg = EasterEgg(pygame.transform.scale(self.assets["easter"], (16, 16)), barrel.rect.topleft + pygame.Vector2(120, 0))
+                    self.easter_egg = EasterEgg(
+                        scaled(self.assets["easter"], (16, 16)),
+                        barrel.rect.topleft + pygame.Vector2(120, 0),
+                    )
 
-                self.turret_explosioner.create_explosion(self.camera.apply(barrel.rect).topleft)
+                self.turret_explosioner.create_explosion(
+                    self.camera.apply(barrel.rect).topleft
+                )
                 self.barrels.remove(barrel)
 
         if self.easter_egg is not None:
@@ -579,16 +637,14 @@ class BarrelStage(PortalStage):
                 SAVE_DATA["has_easter_egg"] = True
 
                 self.sfx_manager.play("item_pickup")
-    
-    def draw(self, screen):
-        super().draw(screen)
-        if self.easter_egg is not None:
-            self.easter_egg.draw(screen, self.camera)
 
-class CameraStage(BarrelStage):
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
+    def draw_easter_egg(self, screen):
+        with self.draw_buffer.layer(Layers.EASTER_EGG):
+            self.easter_egg.draw(self.draw_buffer, self.camera)
+
 
+class CameraStage(BarrelStage):
+    def update_camera(self, event_info: EventInfo):
         self.camera.adjust_to(event_info["dt"], self.player.rect)
 
 
@@ -600,37 +656,46 @@ class UIStage(CameraStage):
     def __init__(self, switch_info: dict) -> None:
         super().__init__(switch_info)
         self.buttons = ()
-        self.healthbar = PlayerHealthBar(self.player, self.particle_manager, (10, 10), 180, 15)
 
-    def update(self, event_info: EventInfo):
+    def reset(self, checkpoint) -> None:
+        super().reset(checkpoint)
+        self.healthbar = PlayerHealthBar(
+            self.player, self.particle_manager, (10, 10), 180, 15
+        )
+
+    def update_ui(self, event_info: EventInfo):
         """
         Update the Button state
 
         Parameters:
             event_info: Information on the window events
         """
-        super().update(event_info)
         for button in self.buttons:
             button.update(event_info["mouse_pos"], event_info["mouse_press"])
 
         self.particle_manager.update(event_info)
 
-    def draw(self, screen: pygame.Surface):
+    def draw_ui(self, screen: pygame.Surface):
         """
         Draw the Button state
 
         Parameters:
             screen: pygame.Surface to draw on
         """
-        super().draw(screen)
-        for button in self.buttons:
-            button.draw(screen)
 
-        self.healthbar.draw(screen)
-        self.particle_manager.draw()
+        def draw_widgets(surf: pygame.Surface) -> None:
+            for button in self.buttons:
+                button.draw(surf)
+            self.healthbar.draw(surf)
 
-        for note in self.notes:
-            note.draw_text(screen, self.camera)
+        with self.draw_buffer.layer(Layers.UI):
+            self.draw_buffer.call(draw_widgets)
+        # particles draw on the screen they were created with
+        with self.draw_buffer.layer(Layers.PARTICLES):
+            self.draw_buffer.call(lambda _: self.particle_manager.draw())
+        with self.draw_buffer.layer(Layers.NOTE_TEXT):
+            for note in self.notes:
+                note.draw_text(self.draw_buffer, self.camera)
 
 
 class SFXStage(UIStage):
@@ -643,35 +708,41 @@ class SFXStage(UIStage):
             self.sfx_manager, self.assets, center_pos=stub_rect.center
         )
 
-        self.sfx_manager.set_volume(SAVE_DATA["last_volume"] * 100)
-        self.sound_icon.slider.value = (
+        # The level may be built on a worker, the volume is
+        # applied by the sound manager once the level is shown
+        self.sound_icon.preset(
             SAVE_DATA["last_volume"] * self.sound_icon.slider.max_value
         )
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
+    def update_sound_icon(self, event_info: EventInfo):
         self.sound_icon.update(event_info)
 
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-        self.sound_icon.draw(screen)
-
+    def draw_sound_icon(self, screen: pygame.Surface):
+        with self.draw_buffer.layer(Layers.SOUND_ICON):
+            self.draw_buffer.call(self.sound_icon.draw)
 
 
 class ExplosionStage(SFXStage):
 
-    def update(self, event_info: EventInfo) -> None:
-        super().update(event_info)
+    def update_explosions(self, event_info: EventInfo) -> None:
         self.explosion_manager.update(event_info["dt"])
         self.turret_explosioner.update(event_info["dt"])
 
         # for event in event_info["events"]:
         #     if event.type == pygame.MOUSEBUTTONDOWN:
 
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
-        self.explosion_manager.draw(screen)
-        self.turret_explosioner.draw(screen)
+    def has_explosions(self) -> bool:
+        return bool(
+            self.explosion_manager.explosions or self.turret_explosioner.explosions
+        )
+
+    def draw_explosions(self, screen: pygame.Surface):
+        def draw(surf: pygame.Surface) -> None:
+            self.explosion_manager.draw(surf)
+            self.turret_explosioner.draw(surf)
+
+        with self.draw_buffer.layer(Layers.EXPLOSIONS):
+            self.draw_buffer.call(draw)
 
 
 class PauseStage(ExplosionStage):
@@ -699,35 +770,59 @@ class PauseStage(ExplosionStage):
             for index, text in enumerate(button_texts)
         ]
 
-    def update(self, event_info: EventInfo):
-        for event in event_info["events"]:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.paused = not self.paused
+        # The darkened world as it was when the game got paused,
+        # drawn instead of the world until it's unpaused
+        self.freeze_frame: Optional[pygame.Surface] = None
+        # Draw systems replaced by the freeze frame, set by Level
+        self.world_systems = ()
 
-        if not self.paused:
-            super().update(event_info)
+    def freeze(self, screen: pygame.Surface) -> None:
+        self.freeze_frame = screen.copy()
+        self.freeze_frame.blit(self.bg_darkener, (0, 0))
+        for name in self.world_systems:
+            self.systems.enable(name, False, phase=DRAW)
+
+    def unfreeze(self) -> None:
+        if self.freeze_frame is None:
             return
 
+        self.freeze_frame = None
+        for name in self.world_systems:
+            self.systems.enable(name, True, phase=DRAW)
+
+    def toggle_pause(self, event_info: EventInfo):
+        for _ in EVENTS.get(pygame.KEYDOWN, key=pygame.K_ESCAPE):
+            self.paused = not self.paused
+
+        if not self.paused:
+            self.unfreeze()
+
+    def update_pause_menu(self, event_info: EventInfo):
         for button in self.pause_buttons:
             button.update(event_info["mouse_pos"], event_info["mouse_press"])
 
             if button.clicked:
                 if button.text == "continue":
                     self.paused = False
+                    self.unfreeze()
                 elif button.text == "main menu":
                     self.next_state = States.MAIN_MENU
 
-    def draw(self, screen: pygame.Surface):
-        super().draw(screen)
+    def draw_pause_menu(self, screen: pygame.Surface):
+        def draw(surf: pygame.Surface) -> None:
+            # Runs once the layers below are drawn,
+            # so the first paused frame has the world to capture
+            if self.freeze_frame is None:
+                self.freeze(surf)
+                surf.blit(self.freeze_frame, (0, 0))
 
-        if not self.paused:
-            return
+            for button in self.pause_buttons:
+                button.draw(surf)
 
-        for button in self.pause_buttons:
-            button.draw(screen)
-
-        screen.blit(self.bg_darkener, (0, 0))
+        with self.draw_buffer.layer(Layers.PAUSE_MENU):
+            if self.freeze_frame is not None:
+                self.draw_buffer.blit(self.freeze_frame, (0, 0))
+            self.draw_buffer.call(draw)
 
 
 class TransitionStage(PauseStage):
@@ -744,8 +839,7 @@ class TransitionStage(PauseStage):
         # on to the next state
         # self.switch_info = {}
 
-    def update(self, event_info: EventInfo):
-        super().update(event_info)
+    def update_transition(self, event_info: EventInfo):
         """
         Update the transition stage
 
@@ -758,9 +852,12 @@ class TransitionStage(PauseStage):
             if self.transition.event:
                 self.next_state = States.LEVEL
 
-    def draw(self, screen: pygame.Surface) -> None:
-        super().draw(screen)
-        self.transition.draw(screen)
+    def transition_visible(self) -> bool:
+        return self.transition.image.get_alpha() > 0
+
+    def draw_transition(self, screen: pygame.Surface) -> None:
+        with self.draw_buffer.layer(Layers.TRANSITION):
+            self.draw_buffer.call(self.transition.draw)
 
 
 class Level(TransitionStage):
@@ -768,6 +865,88 @@ class Level(TransitionStage):
     Final element of stages chain
     """
 
+    def __init__(self, switch_info: dict) -> None:
+        super().__init__(switch_info)
+        self.systems = SystemScheduler()
+        self.add_systems()
+        self.reset(SAVE_DATA["latest_checkpoint"])
+
+    def add_systems(self) -> None:
+        """
+        Lists what the stages do each frame, in the order they do it
+        """
+        running = lambda: not self.paused
+        paused = lambda: self.paused
+
+        add = self.systems.add
+        add(UPDATE, "pause", self.toggle_pause)
+        add(UPDATE, "background", self.update_background, running)
+        add(
+            UPDATE,
+            "shooters",
+            self.update_shooters,
+            lambda: running() and self.shooters,
+        )
+        add(UPDATE, "player", self.update_player, running)
+        add(UPDATE, "special_tiles", self.update_special_tiles, running)
+        add(UPDATE, "enemies", self.update_enemies, lambda: running() and self.enemies)
+        add(UPDATE, "spikes", self.update_spikes, lambda: running() and self.spikes)
+        add(UPDATE, "checkpoints", self.update_checkpoints, running)
+        add(UPDATE, "notes", self.update_notes, lambda: running() and self.notes)
+        add(UPDATE, "portals", self.update_portals, running)
+        add(
+            UPDATE,
+            "barrels",
+            self.update_barrels,
+            lambda: running() and (self.barrels or self.easter_egg is not None),
+        )
+        add(UPDATE, "camera", self.update_camera, running)
+        add(UPDATE, "ui", self.update_ui, running)
+        add(UPDATE, "sound_icon", self.update_sound_icon, running)
+        add(
+            UPDATE,
+            "explosions",
+            self.update_explosions,
+            lambda: running() and self.has_explosions(),
+        )
+        add(UPDATE, "pause_menu", self.update_pause_menu, paused)
+        add(UPDATE, "transition", self.update_transition)
+
+        # The draw systems only queue their drawing, the buffer sorts it by layer
+        add(DRAW, "background", self.draw_background)
+        add(DRAW, "checkpoints", self.draw_checkpoints)
+        add(DRAW, "portals", self.draw_portals)
+        add(DRAW, "notes", self.draw_notes, lambda: self.notes)
+        add(DRAW, "barrels", self.draw_barrels, lambda: self.barrels)
+        add(DRAW, "enemies", self.draw_enemies, lambda: self.enemies)
+        add(DRAW, "shooters", self.draw_shooters, lambda: self.shooters)
+        add(DRAW, "wife", self.draw_wife, lambda: self.ending)
+        add(DRAW, "map", self.draw_map)
+        add(DRAW, "player", self.draw_player)
+        add(DRAW, "spikes", self.draw_spikes, lambda: self.spikes)
+        add(
+            DRAW,
+            "easter_egg",
+            self.draw_easter_egg,
+            lambda: self.easter_egg is not None,
+        )
+        add(DRAW, "ui", self.draw_ui)
+        add(DRAW, "sound_icon", self.draw_sound_icon)
+        add(DRAW, "explosions", self.draw_explosions, self.has_explosions)
+        # Drawn once when pausing, then replaced by the freeze frame
+        self.world_systems = tuple(system.name for system in self.systems.phases[DRAW])
+
+        add(DRAW, "pause_menu", self.draw_pause_menu, paused)
+        # Fully faded in, the transition would blit a transparent screen
+        add(DRAW, "transition", self.draw_transition, self.transition_visible)
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the screen changes, the paused level shows a still frame
+        """
+        return not self.paused or self.transition_visible()
+
     def update(self, event_info: EventInfo):
         """
         Update the Level state
@@ -775,7 +954,7 @@ class Level(TransitionStage):
         Parameters:
             event_info: Information on the window events
         """
-        super().update(event_info)
+        self.systems.run(UPDATE, event_info)
 
     def draw(self, screen: pygame.Surface):
         """
@@ -784,4 +963,5 @@ class Level(TransitionStage):
         Parameters:
             screen: pygame.Surface to draw on
         """
-        super().draw(screen)
+        self.systems.run(DRAW, screen)
+        self.draw_buffer.flush(screen)
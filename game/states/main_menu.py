@@ -12,6 +12,7 @@ import library.utils
 from game.background import ParallaxBackground
 from game.common import HEIGHT, SAVE_DATA, WIDTH, EventInfo
 from game.states.enums import States
+from library.render import DirtyRegions
 from library.sfx import SFXManager
 from library.sprite.load import load_assets
 from library.transition import FadeTransition
@@ -49,8 +50,16 @@ class UIStage(RenderBackgroundStage):
     Handles buttons
     """
 
+    # States the buttons lead to, built ahead of time while hovered
+    BUTTON_STATES = {
+        "start": States.LEVEL,
+        "intro": States.DIALOGUE,
+        "credits": States.CREDITS,
+    }
+
     def __init__(self, switch_info: dict) -> None:
         super().__init__(switch_info)
+        self.upcoming_state: Optional[States] = None
 
         texts = ("start", "intro", "reset", "credits")
         button_pad_y = 20
@@ -86,6 +95,9 @@ class UIStage(RenderBackgroundStage):
         for button in self.buttons:
             button.update(event_info["mouse_pos"], event_info["mouse_press"])
 
+            if button.state == "hover" and button.text in self.BUTTON_STATES:
+                self.upcoming_state = self.BUTTON_STATES[button.text]
+
             if button.clicked:
                 if button.text == "start":
                     self._change_dim = True
@@ -94,18 +106,18 @@ class UIStage(RenderBackgroundStage):
                     self._change_dim = True
                     self._next_state = States.DIALOGUE
                 elif button.text == "reset":
-                    SAVE_DATA.update({
-                        "first_time": True,
-                        "has_ring": False,
-                        "has_easter_egg": False,
-                        "last_volume": 0.09,
-                        "latest_checkpoint": [
-                            0, 0
-                        ],
-                        "latest_checkpoint_id": 0,
-                        "num_extra_dims_unlocked": 0,
-                        "latest_dimension": "parallel_dimension"
-                    })
+                    SAVE_DATA.update(
+                        {
+                            "first_time": True,
+                            "has_ring": False,
+                            "has_easter_egg": False,
+                            "last_volume": 0.09,
+                            "latest_checkpoint": [0, 0],
+                            "latest_checkpoint_id": 0,
+                            "num_extra_dims_unlocked": 0,
+                            "latest_dimension": "parallel_dimension",
+                        }
+                    )
                     self.transition.fade_out_in()
                 elif button.text == "credits":
                     self._change_dim = True
@@ -163,4 +175,24 @@ class TransitionStage(UIStage):
 
 
 class MainMenu(TransitionStage):
-    pass
+    def __init__(self, switch_info: dict) -> None:
+        super().__init__(switch_info)
+        # Only what changed gets redrawn and presented
+        self.regions = DirtyRegions((WIDTH, HEIGHT))
+        self.dirty_rects = None
+
+    def draw(self, screen: pygame.Surface) -> None:
+        self.regions.track(
+            "background",
+            screen.get_rect(),
+            self.background.offsets(screen.get_width(), self.bg_scroll),
+        )
+        for button in self.buttons:
+            self.regions.track(button.text, button.rect, button.state)
+
+        # Fading repaints the whole screen, until it's fully faded in
+        self.regions.track(
+            "transition", screen.get_rect(), self.transition.image.get_alpha()
+        )
+
+        self.dirty_rects = self.regions.draw(screen, super().draw)
@@ -2,8 +2,8 @@
 This file is a part of the 'Unnamed' source code.
 The source code is distributed under the MIT license.
 
-An explosion, is essentially just a way to 
-handle particles going in all directions with 
+An explosion, is essentially just a way to
+handle particles going in all directions with
 different sizes and speeds
 This causes a nice explosion based effect
 
@@ -11,7 +11,6 @@ You can also specify an angle of the explosion to
 explode around that place, explosions are great
 """
 
-
 import json
 import random
 from typing import List, Set
@@ -21,6 +20,8 @@ import pygame
 from game.common import DATA_DIR
 from library.common import Pos
 from library.particles import AngularParticle
+from library.perf.quality import QUALITY
+from library.perf.trace import TRACER
 
 
 class Explosion:
@@ -74,16 +75,17 @@ class ExplosionManager:
         self.exp_type: str = exp_type
         self.explosions: Set[Explosion] = set()
 
+    @TRACER.traced()
     def create_explosion(self, pos: Pos):
         data = self.EXP_TYPES[self.exp_type]
         self.explosions.add(
             Explosion(
-                n_particles=data["n_particles"],
+                n_particles=QUALITY.particles(data["n_particles"]),
                 n_size=data["n_size"],
                 pos=pos,
                 speed=data["speed"],
                 color=data["color"],
-                glow=data["glow"],
+                glow=data["glow"] and QUALITY.tier.glow,
                 size_reduction=data["size_reduction"],
             )
         )
@@ -0,0 +1,102 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Indexes each frame's window events once, so components look up
+the events they care about instead of scanning the whole list
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+EventCallback = Callable[[pygame.event.Event], None]
+
+
+def _key_of(event: pygame.event.Event) -> Optional[int]:
+    # Keyboard events are told apart by key, mouse button events by button
+    key = getattr(event, "key", None)
+    return key if key is not None else getattr(event, "button", None)
+
+
+class EventBus:
+    """
+    Holds the current frame's events indexed by type and by (type, key),
+    and calls the subscribed callbacks for them once per frame
+    """
+
+    def __init__(self) -> None:
+        self._by_type: Dict[int, List[pygame.event.Event]] = defaultdict(list)
+        self._by_key: Dict[Tuple[int, int], List[pygame.event.Event]] = defaultdict(
+            list
+        )
+        self._order: Dict[int, int] = {}
+        self._subscribers: Dict[Hashable, List[EventCallback]] = defaultdict(list)
+
+    def subscribe(
+        self, event_type: int, callback: EventCallback, key: Optional[int] = None
+    ) -> None:
+        """
+        Calls callback with every event of the type dispatched from now on
+
+        Parameters:
+            event_type: pygame event type
+            callback: Called with the event
+            key: Only events with this key (or mouse button)
+        """
+        self._subscribers[event_type, key].append(callback)
+
+    def unsubscribe(
+        self, event_type: int, callback: EventCallback, key: Optional[int] = None
+    ) -> None:
+        self._subscribers[event_type, key].remove(callback)
+
+    def dispatch(self, events: List[pygame.event.Event]) -> None:
+        """
+        Replaces the indexed events with a new frame's,
+        then calls the subscribers of the ones that happened
+        """
+        self._by_type.clear()
+        self._by_key.clear()
+        self._order.clear()
+
+        for order, event in enumerate(events):
+            self._order[id(event)] = order
+            self._by_type[event.type].append(event)
+            key = _key_of(event)
+            if key is not None:
+                self._by_key[event.type, key].append(event)
+
+        for (event_type, key), callbacks in list(self._subscribers.items()):
+            for event in self.get(event_type, key=key):
+                for callback in tuple(callbacks):
+                    callback(event)
+
+    def get(
+        self, *event_types: int, key: Optional[int] = None
+    ) -> List[pygame.event.Event]:
+        """
+        This frame's events of the given types, in the order they happened
+
+        Parameters:
+            event_types: pygame event types
+            key: Only events with this key (or mouse button)
+        """
+        if key is None:
+            found = [self._by_type.get(event_type, ()) for event_type in event_types]
+        else:
+            found = [
+                self._by_key.get((event_type, key), ()) for event_type in event_types
+            ]
+
+        if len(found) == 1:
+            return list(found[0])
+
+        return sorted(
+            (event for events in found for event in events),
+            key=lambda event: self._order[id(event)],
+        )
+
+
+EVENTS = EventBus()
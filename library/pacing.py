@@ -0,0 +1,100 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Lowers the frame rate while nothing on screen changes
+or the window is in the background
+"""
+
+import time
+
+import pygame
+
+from library.events import EventBus
+
+# Events that bring the frame rate back up right away
+INPUT_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.WINDOWFOCUSGAINED,
+    pygame.WINDOWRESTORED,
+)
+
+
+class FramePacer:
+    """
+    Picks the frame rate from the window focus, the last input
+    and whether the current state reports changes on screen
+    """
+
+    def __init__(
+        self,
+        fps: int,
+        idle_fps: int = 10,
+        unfocused_fps: int = 20,
+        grace: float = 0.5,
+    ) -> None:
+        """
+        Parameters:
+            fps: Frame rate while anything happens
+            idle_fps: Frame rate while the screen doesn't change.
+                Delta times are capped at 0.1 seconds,
+                lower rates would slow the game down
+            unfocused_fps: Frame rate while the window is in the background
+            grace: Seconds the full frame rate is kept after an input
+        """
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.unfocused_fps = unfocused_fps
+        self.grace = grace
+
+        self.focused = True
+        self.last_input = time.perf_counter()
+
+    def watch(self, events: EventBus) -> None:
+        """
+        Subscribes to the window and input events the pacing depends on
+        """
+        for event_type in INPUT_EVENTS:
+            events.subscribe(event_type, self._on_input)
+
+        for event_type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED):
+            events.subscribe(event_type, self._on_focus)
+        for event_type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+            events.subscribe(event_type, self._on_focus_lost)
+
+    def _on_input(self, event: pygame.event.Event) -> None:
+        self.last_input = time.perf_counter()
+
+    def _on_focus(self, event: pygame.event.Event) -> None:
+        self.focused = True
+
+    def _on_focus_lost(self, event: pygame.event.Event) -> None:
+        self.focused = False
+
+    def target(self, dirty: bool) -> int:
+        """
+        Frame rate for the next frame
+
+        Parameters:
+            dirty: Whether the current state changes what's on screen
+        """
+        if not self.focused:
+            if dirty:
+                return self.unfocused_fps
+            return min(self.idle_fps, self.unfocused_fps)
+
+        if dirty or time.perf_counter() - self.last_input < self.grace:
+            return self.fps
+        return self.idle_fps
+
+    @staticmethod
+    def input_pending() -> bool:
+        """
+        Whether input arrived that wasn't handled yet
+        """
+        return pygame.event.peek(INPUT_EVENTS)
@@ -0,0 +1,9 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
+from library.perf.gc_policy import GC_POLICY, GCPolicy
+from library.perf.quality import QUALITY, QualityGovernor, Tier
+from library.perf.spikes import SpikeWatchdog
+from library.perf.trace import TRACER, Tracer
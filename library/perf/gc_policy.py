@@ -0,0 +1,147 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Keeps garbage collection pauses out of gameplay by moving the
+long-lived heap out of the collector's reach and collecting
+fully only while the screen is covered
+"""
+
+import collections
+import gc
+import threading
+import time
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Young collections run less often than the default (700, 10, 10),
+# full ones hardly ever, they are run explicitly instead
+GAMEPLAY_THRESHOLDS = (2000, 20, 100)
+
+
+@dataclass(frozen=True)
+class Collection:
+    generation: int
+    # Seconds the collection paused the thread that triggered it
+    pause: float
+    collected: int
+    # Run by settle rather than by the collector's thresholds
+    explicit: bool
+
+
+class GCPolicy:
+    """
+    Collects everything and freezes what's left once a newly built or
+    reset state is shown behind a covering transition, so the maps, tiles
+    and assets it holds aren't scanned by the collections happening
+    during gameplay. Also times every collection
+    """
+
+    def __init__(
+        self,
+        thresholds: Tuple[int, int, int] = GAMEPLAY_THRESHOLDS,
+        window: int = 300,
+    ) -> None:
+        """
+        Parameters:
+            thresholds: Collection thresholds used from watch on
+            window: Amount of collections kept in history
+        """
+        self.thresholds = thresholds
+
+        # Latest collections, oldest first
+        self.history: Deque[Collection] = collections.deque(maxlen=window)
+        # Total amount of collections timed, explicit ones included
+        self.collections = 0
+        # Amount of explicit collections run, the heap is frozen after each
+        self.settles = 0
+        # Seconds the last explicit collection took
+        self.settle_time = 0.0
+        # A state was built or reset since the last explicit collection
+        self.pending = False
+
+        # Thread running settle, if any
+        self._settling: Optional[int] = None
+        # Collections can be triggered on any thread. Nothing here is locked:
+        # allocating while holding a lock could start a collection whose
+        # callback then waits for that same lock
+        self._starts: Dict[int, float] = {}
+
+    def watch(self) -> None:
+        """
+        Applies the thresholds and starts timing collections
+        """
+        gc.set_threshold(*self.thresholds)
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        thread = threading.get_ident()
+        now = time.perf_counter()
+        if phase == "start":
+            self._starts[thread] = now
+            return
+
+        start = self._starts.pop(thread, now)
+        explicit = self._settling == thread
+        self.history.append(
+            Collection(info["generation"], now - start, info["collected"], explicit)
+        )
+        self.collections += 1
+
+    def since(self, count: int) -> List[Collection]:
+        """
+        The collections timed after collections was count
+        """
+        # Copied in one go, iterating the deque itself would fail
+        # if a collection appended to it meanwhile
+        history = self.history.copy()
+        new = min(self.collections - count, len(history))
+        return list(history)[len(history) - new :]
+
+    def state_changed(self) -> None:
+        """
+        Marks that a state was built or reset, the next
+        covered frame collects its leftovers
+        """
+        self.pending = True
+
+    def update(self, covered: bool) -> None:
+        """
+        Collects once after a state change, as soon as the screen is covered
+
+        Parameters:
+            covered: Whether a transition hides the whole screen
+        """
+        if covered and self.pending:
+            self.settle()
+
+    def settle(self) -> None:
+        """
+        Collects all generations, then freezes the surviving objects
+        so later collections skip them
+        """
+        start = time.perf_counter()
+        self._settling = threading.get_ident()
+        try:
+            # Frozen objects that became garbage since are only found when unfrozen
+            gc.unfreeze()
+            gc.collect()
+            gc.freeze()
+        finally:
+            self._settling = None
+        self.settle_time = time.perf_counter() - start
+        self.settles += 1
+        self.pending = False
+
+    def pauses(self) -> List[float]:
+        """
+        Seconds of the collections in history that ran during gameplay
+        """
+        return [
+            collection.pause
+            for collection in self.history.copy()
+            if not collection.explicit
+        ]
+
+
+GC_POLICY = GCPolicy()
@@ -0,0 +1,123 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Trades visual effects for frame time when frames
+run over budget, and brings them back once they don't
+"""
+
+import logging
+import statistics
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Sequence
+
+logger = logging.getLogger()
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    # Fraction of the configured particles that get spawned
+    particles: float
+    glow: bool
+    # Fraction of the background shapes that get spawned
+    background: float
+
+
+TIERS = (
+    Tier("low", particles=0.25, glow=False, background=0.35),
+    Tier("medium", particles=0.5, glow=False, background=0.7),
+    Tier("high", particles=1.0, glow=True, background=1.0),
+)
+
+
+class QualityGovernor:
+    """
+    Watches a rolling window of frame times and steps the quality
+    tier down while frames run over budget, up while they have
+    plenty of room. The thresholds are apart and the window starts
+    over after every step, so the tier doesn't flicker
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Tier] = TIERS,
+        budget: float = 1 / 60,
+        window: int = 60,
+        downgrade_at: float = 1.0,
+        upgrade_at: float = 0.6,
+        upgrade_after: int = 180,
+    ) -> None:
+        """
+        Parameters:
+            tiers: Tiers from lowest to highest quality, starts at the highest
+            budget: Seconds a frame may take
+            window: Amount of frames looked at before stepping
+            downgrade_at: Fraction of the budget the typical frame
+                has to take for the tier to step down
+            upgrade_at: Fraction of the budget the typical frame
+                has to stay under for the tier to step up
+            upgrade_after: Amount of frames in a row the typical frame has
+                to stay under that, so a tier that was just too slow
+                isn't tried again right away
+        """
+        self.tiers = tuple(tiers)
+        self.budget = budget
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.upgrade_after = upgrade_after
+
+        self.level = len(self.tiers) - 1
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.calm_frames = 0
+
+    @property
+    def tier(self) -> Tier:
+        return self.tiers[self.level]
+
+    def record(self, frame_time: float) -> None:
+        """
+        Adds the time a frame took to update and draw,
+        without the time spent waiting for the next one
+
+        Parameters:
+            frame_time: Seconds
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return
+
+        # The median ignores single hitches like loading a map,
+        # lowering the effects wouldn't help with those
+        typical = statistics.median(self.frame_times)
+        if typical > self.budget * self.downgrade_at and self.level > 0:
+            self._step(-1, typical)
+            return
+
+        if typical < self.budget * self.upgrade_at:
+            self.calm_frames += 1
+        else:
+            self.calm_frames = 0
+
+        if self.calm_frames >= self.upgrade_after and self.level < len(self.tiers) - 1:
+            self._step(1, typical)
+
+    def _step(self, step: int, typical: float) -> None:
+        self.level += step
+        self.frame_times.clear()
+        self.calm_frames = 0
+        logger.info(
+            f"Quality set to {self.tier.name}, frames took {typical * 1000:.1f}ms"
+        )
+
+    def particles(self, amount: int) -> int:
+        """
+        Amount of particles to spawn in place of the configured amount
+        """
+        if amount <= 0:
+            return amount
+        return max(1, round(amount * self.tier.particles))
+
+
+QUALITY = QualityGovernor()
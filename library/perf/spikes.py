@@ -0,0 +1,163 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Writes down what happened during frames that took too long,
+so hitches can be told apart after the fact
+"""
+
+import collections
+import gc
+import json
+import logging
+import logging.handlers
+import pathlib
+import time
+from typing import Callable, Optional
+
+from library.perf.gc_policy import GC_POLICY, GCPolicy
+from library.perf.trace import TRACER, Tracer
+
+# Amount of object types listed per spike
+N_OBJECT_TYPES = 10
+
+
+class SpikeWatchdog:
+    """
+    Looks at every frame's time and, when one exceeds the threshold,
+    appends a snapshot of its garbage collections, object counts and,
+    while the tracer records, its spans to a log file that's rotated
+    once it grows too big. Frames that aren't spikes cost a few
+    counter reads
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        threshold: float = 0.05,
+        max_bytes: int = 512 * 1024,
+        tracer: Tracer = TRACER,
+        gc_policy: GCPolicy = GC_POLICY,
+        defer: Optional[Callable[[Callable], None]] = None,
+    ) -> None:
+        """
+        Parameters:
+            path: File the spikes are appended to as JSON lines,
+                the previous file is kept next to it when it's rotated
+            threshold: Seconds a frame may take before it counts as a spike
+            max_bytes: Size the file is rotated at
+            tracer: Tracer whose spans are snapshotted while it records
+            gc_policy: Policy timing the garbage collections, must be watching
+            defer: Queues a callable to run later, used to count the objects
+                and write the spike outside of the frames being measured.
+                None does it right away
+        """
+        self.threshold = threshold
+        self.tracer = tracer
+        self.gc_policy = gc_policy
+        self.defer = defer
+        self.spikes = 0
+
+        self.log = logging.getLogger(f"spikes.{path}")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=1, delay=True
+        )
+        self.log.addHandler(handler)
+
+        self._frame = 0
+        self._frame_start = 0.0
+        self._span_mark = 0
+        self._gc_mark = 0
+        self._gc_count = (0, 0, 0)
+        # Object counts of the last census, None before the first spike.
+        # Frozen objects aren't listed by the collector, so counts are
+        # only compared while no settle froze the heap in between
+        self._objects: Optional[collections.Counter] = None
+        self._objects_settles = 0
+
+    def begin_frame(self) -> None:
+        self._frame += 1
+        self._frame_start = time.perf_counter()
+        self._span_mark = self.tracer.count
+        self._gc_mark = self.gc_policy.collections
+        self._gc_count = gc.get_count()
+
+    def end_frame(self, busy: float, **context) -> Optional[dict]:
+        """
+        Snapshots the frame if it was a spike. Its object counts are
+        added and it's written once the deferred census ran
+
+        Parameters:
+            busy: Seconds the frame took, without the time it waited
+                for its deadline on purpose
+            context: What the game was doing, written along
+
+        Returns:
+            The snapshot, None if the frame wasn't a spike.
+            Its object deltas are None when a settle happened
+            since the last census, which is taken as the new baseline
+        """
+        if busy <= self.threshold:
+            return None
+
+        self.spikes += 1
+        spike = {
+            "time": time.time(),
+            "frame": self._frame,
+            "ms": busy * 1000,
+            "threshold_ms": self.threshold * 1000,
+            **context,
+            "gc": [
+                {
+                    "generation": collection.generation,
+                    "ms": collection.pause * 1000,
+                    "collected": collection.collected,
+                    "explicit": collection.explicit,
+                }
+                for collection in self.gc_policy.since(self._gc_mark)
+            ],
+            "gc_count_before": self._gc_count,
+            "gc_count_after": gc.get_count(),
+        }
+        # Spans are only known while the tracer records
+        if self.tracer.enabled:
+            spike["spans"] = [
+                {
+                    "name": name,
+                    "start_ms": (start - self._frame_start) * 1000,
+                    "ms": (end - start) * 1000,
+                    "thread": self.tracer.thread_names.get(thread, thread),
+                }
+                for name, start, end, thread in self.tracer.spans(since=self._span_mark)
+            ]
+
+        if self.defer is None:
+            self._finish(spike)
+        else:
+            self.defer(lambda: self._finish(spike))
+
+        return spike
+
+    def _finish(self, spike: dict) -> None:
+        # Walks the whole heap, so it runs after the frames being measured
+        start = time.perf_counter()
+        objects = collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+        spike["census_ms"] = (time.perf_counter() - start) * 1000
+        spike["frozen"] = gc.get_freeze_count()
+
+        # Types whose amount changed the most since the last spike
+        spike["object_deltas"] = None
+        settles = self.gc_policy.settles
+        if self._objects is not None and self._objects_settles == settles:
+            deltas = objects.copy()
+            deltas.subtract(self._objects)
+            changed = sorted(deltas.items(), key=lambda item: -abs(item[1]))
+            spike["object_deltas"] = {
+                name: delta for name, delta in changed[:N_OBJECT_TYPES] if delta
+            }
+        self._objects = objects
+        self._objects_settles = settles
+
+        self.log.info(json.dumps(spike))
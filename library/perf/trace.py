@@ -0,0 +1,184 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Records named spans of time into a fixed size ring buffer
+and exports them as Chrome trace events, viewable in
+chrome://tracing or ui.perfetto.dev
+"""
+
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Span as (name, start, end, thread id), times in perf_counter seconds
+Span = Tuple[str, float, float, int]
+
+
+class Tracer:
+    """
+    Keeps the latest spans in preallocated slots, overwriting the oldest
+    once full. While disabled, span and traced cost one attribute check,
+    so the hooks can stay in release builds
+    """
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        """
+        Parameters:
+            capacity: Amount of spans kept
+        """
+        self.capacity = capacity
+        self.enabled = False
+
+        self._names: List[str] = [""] * capacity
+        self._starts: List[float] = [0.0] * capacity
+        self._ends: List[float] = [0.0] * capacity
+        self._threads: List[int] = [0] * capacity
+        # Total amount of spans recorded, the next slot is count % capacity
+        self.count = 0
+        self._lock = threading.Lock()
+        # Names of the threads spans were recorded on, by thread id
+        self.thread_names = {}
+
+    def start(self) -> None:
+        """
+        Clears the buffer and starts recording
+        """
+        with self._lock:
+            self.count = 0
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """
+        Adds a span measured elsewhere
+
+        Parameters:
+            name: Name the span is shown with
+            start: perf_counter() when it began
+            end: perf_counter() when it ended
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            slot = self.count % self.capacity
+            self.count += 1
+            self._names[slot] = name
+            self._starts[slot] = start
+            self._ends[slot] = end
+            self._threads[slot] = thread.ident
+            self.thread_names[thread.ident] = thread.name
+
+    def span(self, name: str):
+        """
+        Context manager recording the time spent in the with block
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """
+        Decorator recording every call of a function as a span
+
+        Parameters:
+            name: Name of the span, the function's qualified name by default
+        """
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, start, time.perf_counter())
+
+            return wrapper
+
+        return decorator
+
+    def spans(self, since: int = 0) -> List[Span]:
+        """
+        The spans in the buffer, oldest first
+
+        Parameters:
+            since: Only spans recorded after count was this value
+        """
+        with self._lock:
+            first = max(since, self.count - self.capacity)
+            return [
+                (
+                    self._names[i % self.capacity],
+                    self._starts[i % self.capacity],
+                    self._ends[i % self.capacity],
+                    self._threads[i % self.capacity],
+                )
+                for i in range(first, self.count)
+            ]
+
+    def export(self, path: pathlib.Path) -> int:
+        """
+        Writes the spans in the buffer as a Chrome trace event file
+
+        Returns:
+            The amount of spans written
+        """
+        spans = self.spans()
+        pid = os.getpid()
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": thread_name},
+            }
+            for tid, thread_name in self.thread_names.items()
+        ]
+        for name, start, end, tid in spans:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        return len(spans)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        self.tracer.record(self.name, self.start, time.perf_counter())
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+TRACER = Tracer()
@@ -0,0 +1,185 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Process wide registry of loaded assets (surfaces, sounds),
+shared between game states and kept alive by reference count
+"""
+
+import contextlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterator, List, Optional
+
+logger = logging.getLogger()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    refs: int = 0
+
+
+class Lease:
+    """
+    References taken on the registry while the lease was active,
+    released all at once when the owner (usually a game state) goes away
+    """
+
+    def __init__(self, registry: "AssetRegistry") -> None:
+        self.registry = registry
+        self.keys: List[Hashable] = []
+        self.released = False
+
+    def release(self) -> None:
+        self.released = True
+        keys, self.keys = self.keys, []
+        for key in keys:
+            self.registry.release(key)
+
+
+class AssetRegistry:
+    """
+    Caches loaded assets by key. Referenced entries are never evicted,
+    unreferenced ones stay resident (so switching back to a state doesn't
+    decode them again) until the budget requires evicting them,
+    least recently used first.
+    """
+
+    def __init__(self, budget: int) -> None:
+        """
+        Parameters:
+            budget: Amount of bytes the resident assets may take up
+                before unreferenced ones get evicted
+        """
+        self.budget = budget
+        self.resident = 0
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def _active_leases(self) -> List[Lease]:
+        if not hasattr(self._local, "leases"):
+            self._local.leases = []
+        return self._local.leases
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[Lease]:
+        """
+        Records every asset fetched on this thread inside the with block,
+        so they can be released together later
+        """
+        lease = Lease(self)
+        self._active_leases().append(lease)
+        try:
+            yield lease
+        finally:
+            self._active_leases().remove(lease)
+
+    def current_lease(self) -> Optional[Lease]:
+        """
+        The innermost lease active on this thread, if any.
+        Lets work handed off to other threads record into it
+        """
+        leases = self._active_leases()
+        return leases[-1] if leases else None
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_of: Callable[[Any], int],
+        lease: Optional[Lease] = None,
+    ) -> Any:
+        """
+        Returns the asset stored under key, loading it if it isn't resident
+
+        Parameters:
+            key: Unique key of the asset, e.g. ("image", path)
+            loader: Called without arguments to load the asset
+            size_of: Returns the amount of bytes a loaded asset takes up
+            lease: Lease to record the reference in,
+                defaults to the one active on this thread
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None:
+            # Loading happens outside the lock so
+            # several threads can decode at once
+            try:
+                value = loader()
+            except MemoryError:
+                logger.warning("Out of memory while loading assets, trimming")
+                self.trim()
+                value = loader()
+
+            entry = _Entry(value, size_of(value))
+
+        with self._lock:
+            # Another thread may have loaded it meanwhile,
+            # or evicted it since the lookup above
+            current = self._entries.get(key)
+            if current is None:
+                self._entries[key] = entry
+                self.resident += entry.size
+            else:
+                entry = current
+
+            self._entries.move_to_end(key)
+            if lease is None:
+                lease = self.current_lease()
+            # Work finishing on another thread after the owner went away
+            # mustn't pin the asset
+            if lease is not None and not lease.released:
+                entry.refs += 1
+                lease.keys.append(key)
+            self._evict(self.budget)
+
+            return entry.value
+
+    def release(self, key: Hashable) -> None:
+        """
+        Drops one reference to the asset stored under key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+
+            entry.refs -= 1
+            self._evict(self.budget)
+
+    def trim(self, target: int = 0) -> None:
+        """
+        Evicts unreferenced assets until at most target bytes are resident,
+        for when memory is needed right away
+        """
+        with self._lock:
+            self._evict(target)
+
+    def _evict(self, target: int) -> None:
+        if self.resident <= target:
+            return
+
+        for key, entry in list(self._entries.items()):
+            if entry.refs:
+                continue
+
+            del self._entries[key]
+            self.resident -= entry.size
+            logger.info(f"Evicted {key}")
+
+            if self.resident <= target:
+                break
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+
+ASSETS = AssetRegistry(budget=64 * 1024 * 1024)
@@ -0,0 +1,306 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+"""
+
+import contextlib
+import math
+import weakref
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+
+import pygame
+
+from library.perf.trace import TRACER
+
+
+class _ScalableCall:
+    """
+    Drawing that takes the scale it draws the world at
+    """
+
+    __slots__ = ("draw",)
+
+    def __init__(self, draw: Callable[[pygame.Surface, float], None]) -> None:
+        self.draw = draw
+
+    def __call__(self, screen: pygame.Surface) -> None:
+        self.draw(screen, 1)
+
+
+class DrawBuffer:
+    """
+    Collects a frame's draw commands tagged with a layer, then submits
+    them sorted by layer, skipping blits that fall outside the screen.
+
+    Has the signature of pygame.Surface.blit, so objects drawing
+    themselves with screen.blit can be handed the buffer instead.
+
+    The world layers can be drawn at a reduced resolution
+    and scaled up once, see scale
+    """
+
+    def __init__(
+        self,
+        size,
+        world_below: Optional[int] = None,
+    ) -> None:
+        """
+        Parameters:
+            size: Size of the surface the buffer gets flushed to
+            world_below: Layers lower than this one hold the world,
+                None if nothing is drawn at the world scale
+        """
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.current_layer = 0
+        self.world_below = world_below
+        # Resolution the world layers are drawn at, relative to the screen.
+        # Below 1 their blits and scalable calls go to a smaller surface that
+        # is scaled up under everything else, up to the first world call that
+        # can't be scaled. It and the world layers above it are drawn at full
+        # resolution, so the layer order holds
+        self.scale = 1.0
+        self._world: Optional[pygame.Surface] = None
+        # Sources of world blits scaled down to the world surface. Entries go
+        # away with their source, surfaces made per object aren't kept alive
+        self._small: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # (layer, barrier, order, command)
+        self._commands: List[tuple] = []
+        self._barrier = 0
+
+        # Counts of the last flushed frame
+        self.submitted = 0
+        self.culled = 0
+        self._culled = 0
+
+    @contextlib.contextmanager
+    def layer(self, layer: int) -> Iterator["DrawBuffer"]:
+        """
+        Tags the commands pushed inside the with block with layer
+        """
+        previous, self.current_layer = self.current_layer, layer
+        try:
+            yield self
+        finally:
+            self.current_layer = previous
+
+    def blit(
+        self,
+        source: pygame.Surface,
+        dest,
+        area: Optional[pygame.Rect] = None,
+        special_flags: int = 0,
+    ) -> pygame.Rect:
+        """
+        Queues a blit in the current layer, dest is in screen space
+        """
+        size = source.get_size() if area is None else pygame.Rect(area).size
+        rect = pygame.Rect((dest[0], dest[1]), size)
+
+        if not self.screen_rect.colliderect(rect):
+            self._culled += 1
+            return rect
+
+        self._commands.append(
+            (
+                self.current_layer,
+                self._barrier,
+                len(self._commands),
+                (source, rect.topleft, area, special_flags),
+            )
+        )
+        return rect
+
+    def call(self, draw: Callable[..., None], scalable: bool = False) -> None:
+        """
+        Queues drawing that can't be expressed as blits (shapes, objects
+        holding on to the screen) in the current layer.
+        Blits of the layer queued before it are drawn before it,
+        the ones queued after it are drawn after it
+
+        Parameters:
+            draw: Called with the surface to draw on
+            scalable: draw also takes the scale of the surface as its
+                second argument, so it can be drawn at the world scale
+        """
+        if scalable:
+            draw = _ScalableCall(draw)
+
+        self._barrier += 1
+        self._commands.append(
+            (self.current_layer, self._barrier, len(self._commands), draw)
+        )
+        self._barrier += 1
+
+    def flush(self, screen: pygame.Surface) -> None:
+        """
+        Draws every queued command on screen and empties the buffer.
+        Runs of blits between calls are submitted with one Surface.blits
+        call, within a layer everything keeps the order it was queued in
+        """
+        commands, self._commands = self._commands, []
+        self.submitted = len(commands)
+        self.culled = self._culled
+        self._barrier = 0
+        self._culled = 0
+
+        commands.sort(key=lambda command: command[:3])
+        if self.scale >= 1 or self.world_below is None:
+            with TRACER.span("draw buffer"):
+                self._draw(screen, commands)
+            return
+
+        split = len(commands)
+        for i, (layer, _, _, queued) in enumerate(commands):
+            if layer >= self.world_below or (
+                callable(queued) and not isinstance(queued, _ScalableCall)
+            ):
+                split = i
+                break
+
+        with TRACER.span("draw buffer"):
+            # Nothing is drawn at the world scale while something covers the
+            # world, such as the pause freeze frame, the upscale is skipped
+            if split:
+                world = self._world_surface()
+                scale = world.get_width() / self.screen_rect.width
+                self._draw_world(world, commands[:split], scale)
+                pygame.transform.scale(world, screen.get_size(), screen)
+            self._draw(screen, commands[split:])
+
+    def _world_surface(self) -> pygame.Surface:
+        size = (
+            max(1, round(self.screen_rect.width * self.scale)),
+            max(1, round(self.screen_rect.height * self.scale)),
+        )
+        if self._world is None or self._world.get_size() != size:
+            self._world = pygame.Surface(size).convert()
+
+        return self._world
+
+    def _draw_world(
+        self, world: pygame.Surface, commands: List[tuple], scale: float
+    ) -> None:
+        """
+        Draws sorted world commands given in screen space on a smaller surface
+        """
+        batch = []
+        for *_, command in commands:
+            if isinstance(command, _ScalableCall):
+                if batch:
+                    world.blits(batch, doreturn=False)
+                    batch = []
+                command.draw(world, scale)
+                continue
+
+            source, dest, area, special_flags = command
+            size = (
+                max(1, round(source.get_width() * scale)),
+                max(1, round(source.get_height() * scale)),
+            )
+            small = self._small.get(source)
+            if (
+                small is None
+                or small.get_size() != size
+                or small.get_alpha() != source.get_alpha()
+            ):
+                # New source, new scale or the source's alpha changed
+                small = self._small[source] = pygame.transform.scale(source, size)
+            if area is not None:
+                area = pygame.Rect(area)
+                area = pygame.Rect(
+                    math.floor(area.x * scale),
+                    math.floor(area.y * scale),
+                    max(1, round(area.width * scale)),
+                    max(1, round(area.height * scale)),
+                )
+            dest = (math.floor(dest[0] * scale), math.floor(dest[1] * scale))
+            batch.append((small, dest, area, special_flags))
+
+        if batch:
+            world.blits(batch, doreturn=False)
+
+    @staticmethod
+    def _draw(screen: pygame.Surface, commands: List[tuple]) -> None:
+        batch = []
+        for *_, command in commands:
+            if callable(command):
+                if batch:
+                    screen.blits(batch, doreturn=False)
+                    batch = []
+                command(screen)
+            else:
+                batch.append(command)
+
+        if batch:
+            screen.blits(batch, doreturn=False)
+
+
+class DirtyRegions:
+    """
+    Tracks where the elements of a screen were drawn and how they looked,
+    so only the regions that changed get redrawn and presented
+    """
+
+    def __init__(self, size) -> None:
+        """
+        Parameters:
+            size: Size of the screen
+        """
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.full = True
+        self._rects: List[pygame.Rect] = []
+        self._drawn: Dict[Hashable, tuple] = {}
+
+    def invalidate(self) -> None:
+        """
+        Makes the next draw redraw and present the whole screen
+        """
+        self.full = True
+
+    def track(self, key: Hashable, rect, state=None) -> None:
+        """
+        Marks an element dirty if it moved or changed since the last frame
+
+        Parameters:
+            key: Identifies the element
+            rect: Where the element is drawn this frame
+            state: Anything that changes the element's look
+        """
+        drawn = (pygame.Rect(rect), state)
+        last = self._drawn.get(key)
+        if last == drawn:
+            return
+
+        self._drawn[key] = drawn
+        self._rects.append(drawn[0])
+        if last is not None:
+            self._rects.append(last[0])
+
+    def draw(
+        self, screen: pygame.Surface, draw: Callable[[pygame.Surface], None]
+    ) -> Optional[List[pygame.Rect]]:
+        """
+        Redraws the dirty regions, the whole screen if it was invalidated.
+        draw has to paint everything under the elements too,
+        it's called once per region with the screen clipped to it
+
+        Returns:
+            The redrawn regions, None if the whole screen was redrawn
+        """
+        rects = [rect.clip(self.screen_rect) for rect in self._rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        self._rects = []
+
+        if self.full or self.screen_rect in rects:
+            self.full = False
+            draw(screen)
+            return None
+
+        clip = screen.get_clip()
+        for rect in rects:
+            screen.set_clip(rect)
+            draw(screen)
+        screen.set_clip(clip)
+
+        return rects
@@ -0,0 +1,161 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Runs background jobs in whatever time is left of a frame
+after updating and drawing, before the frame is presented
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Generator, Optional, Union
+
+logger = logging.getLogger()
+
+# A job is either called once, or a generator resumed once per step
+# until it is exhausted, so long work can be spread over several frames
+Job = Union[Callable[[], object], Generator]
+
+
+class FrameScheduler:
+    """
+    Knows the deadline of the current frame and spends the time until
+    then running queued jobs, instead of sleeping it away
+    """
+
+    def __init__(
+        self,
+        fps: int,
+        margin: float = 0.001,
+        max_wait: float = 0.25,
+    ) -> None:
+        """
+        Parameters:
+            fps: Target frame rate, 0 runs uncapped
+            margin: Seconds kept free before the deadline, a job step
+                isn't started with less than that left
+            max_wait: Seconds after which a waiting job gets a step even
+                if the frame is over budget, so it can't starve
+        """
+        self._fps = fps
+        self.margin = margin
+        self.max_wait = max_wait
+
+        # When the current frame started, its deadline is a frame time later
+        self._frame_start = time.perf_counter()
+        self.deadline = self._frame_start + self.frame_time
+        self._jobs: Deque[Job] = deque()
+        self._last_step = time.perf_counter()
+        self._tasks = set()
+
+    @property
+    def fps(self) -> int:
+        return self._fps
+
+    @fps.setter
+    def fps(self, fps: int) -> None:
+        # The deadline follows a new frame rate right away, a frame
+        # woken early from a low rate mustn't wait out its long frame
+        if fps != self._fps:
+            self._fps = fps
+            self.deadline = self._frame_start + self.frame_time
+
+    @property
+    def frame_time(self) -> float:
+        return 1 / self.fps if self.fps else 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs) + len(self._tasks)
+
+    def add(self, job) -> None:
+        """
+        Queues a job to run in idle frame time.
+        Callables and generators may be queued from any thread
+
+        Parameters:
+            job: A callable, a generator (one step per resume)
+                or a coroutine (run as an asyncio task)
+        """
+        if inspect.iscoroutine(job):
+            # Coroutines run on the event loop while the frame sleeps
+            task = asyncio.ensure_future(job)
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+            return
+
+        if not self._jobs:
+            self._last_step = time.perf_counter()
+        self._jobs.append(job)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background task failed", exc_info=task.exception())
+
+    def remaining(self) -> float:
+        """
+        Seconds left until the current frame's deadline
+        """
+        return self.deadline - time.perf_counter()
+
+    def _step(self) -> None:
+        job = self._jobs.popleft()
+        try:
+            if inspect.isgenerator(job):
+                next(job)
+                # Not done yet, gets resumed after the other jobs had a turn
+                self._jobs.append(job)
+            else:
+                job()
+        except StopIteration:
+            pass
+        except Exception:
+            logger.exception(f"Background job {job} failed")
+
+        self._last_step = time.perf_counter()
+
+    def run_jobs(self) -> None:
+        """
+        Runs queued jobs until the deadline is close
+        """
+        if self._jobs and time.perf_counter() - self._last_step > self.max_wait:
+            self._step()
+
+        while self._jobs and self.remaining() > self.margin:
+            self._step()
+
+    async def idle(
+        self, wake: Optional[Callable[[], bool]] = None, poll: float = 1 / 60
+    ) -> None:
+        """
+        Spends the rest of the frame running jobs, then sleeps until
+        the deadline and starts the next frame.
+        Sleeping through asyncio lets coroutine jobs (and the browser) run
+
+        Parameters:
+            wake: Checked every poll seconds while sleeping,
+                the frame ends early once it returns True
+            poll: Seconds between wake checks
+        """
+        self.run_jobs()
+
+        if wake is None:
+            await asyncio.sleep(max(self.remaining(), 0))
+        else:
+            while self.remaining() > 0:
+                await asyncio.sleep(min(self.remaining(), poll))
+                if wake():
+                    self.deadline = time.perf_counter()
+                    break
+
+        # Frames that overran start counting from now instead of
+        # rushing to catch up with the missed deadlines
+        self._frame_start = max(self.deadline, time.perf_counter())
+        self.deadline = self._frame_start + self.frame_time
+
+
+SCHEDULER = FrameScheduler(fps=60)
@@ -5,28 +5,101 @@ The source code is distributed under the MIT license.
 
 import json
 import logging
+import math
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 
 import pygame
 
-from game.common import SAVE_DATA
+from library.registry import ASSETS, Lease
 
 logger = logging.getLogger()
 
 
 pygame.mixer.init()
 
+_decoder: Optional[ThreadPoolExecutor] = None
+
+# Path of the background music currently streaming
+_current_bgm: Optional[str] = None
+
 
 @dataclass
 class SoundObj:
-    sound: pygame.mixer.Sound
+    sound: Optional[pygame.mixer.Sound]
     original_volume: float
+    # Volume to apply once the sound finished decoding
+    volume: float = 0
+    pending: Optional[Future] = None
+
+    # How many instances of the sound may play at once
+    max_voices: int = 4
+    # Higher priority sounds take channels from lower priority ones
+    priority: int = 1
+    # Positional sounds further away from the listener than this aren't played
+    max_distance: float = 15 * 16
+
+    def ready(self) -> bool:
+        """
+        Whether the sound is decoded, installs it if it just finished
+        """
+        if self.pending is not None and self.pending.done():
+            self.sound = self.pending.result()
+            self.sound.set_volume(self.volume)
+            self.pending = None
+
+        return self.sound is not None
+
+
+def sound_size(sound: pygame.mixer.Sound) -> int:
+    """
+    Amount of bytes taken up by a decoded sound
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+
+def load_sound(path, lease: Optional[Lease] = None) -> pygame.mixer.Sound:
+    """
+    Decodes a sound, reusing it if it's already resident in the asset registry
+
+    Parameters:
+        path: Path of the sound file
+        lease: Lease to record the reference in
+    """
+
+    def loader():
+        logger.info(f"Loaded {path}")
+        return pygame.mixer.Sound(path)
+
+    return ASSETS.get(("sound", str(path)), loader, sound_size, lease)
+
+
+def _decode(path, lease: Optional[Lease]) -> Future:
+    """
+    Starts decoding a sound on the background worker,
+    sounds that are already resident are handed out right away
+    """
+    global _decoder
+
+    if sys.platform == "emscripten" or ("sound", str(path)) in ASSETS:
+        future = Future()
+        future.set_result(load_sound(path, lease))
+        return future
+
+    if _decoder is None:
+        _decoder = ThreadPoolExecutor(1, thread_name_prefix="audio")
+    return _decoder.submit(load_sound, path, lease)
 
 
 def load_sfx(state: str) -> dict:
     assets = {}
     path = Path("assets/audio/")
+    # the worker records its references for whoever is loading right now
+    lease = ASSETS.current_lease()
 
     json_files = path.rglob("*.json")
     for metadata_f in json_files:
@@ -36,36 +109,205 @@ def load_sfx(state: str) -> dict:
                 continue
 
             complete_path = metadata_f.parent / file
-            logger.info(f"Loaded {complete_path}")
-
-            sound = pygame.mixer.Sound(complete_path)
+            file_extension = file[file.find(".") :]
+            name = file.replace(file_extension, "")
 
-            sound.set_volume(data["volume"])
+            asset = SoundObj(
+                None,
+                data["volume"],
+                data["volume"],
+                max_voices=data.get("max_voices", SoundObj.max_voices),
+                priority=data.get("priority", SoundObj.priority),
+                max_distance=data.get("max_distance", SoundObj.max_distance),
+            )
+            # background music is streamed by pygame.mixer.music instead
+            if name != "bgm":
+                asset.pending = _decode(complete_path, lease)
 
-            asset = SoundObj(sound, data["volume"])
-            file_extension = file[file.find(".") :]
-            assets[file.replace(file_extension, "")] = asset
+            assets[name] = asset
 
     return assets
 
 
+def play_bgm(path: str) -> None:
+    """
+    Streams background music on loop, unless it's already playing
+    """
+    global _current_bgm
+
+    if _current_bgm == path and pygame.mixer.music.get_busy():
+        return
+
+    pygame.mixer.music.load(path)
+    pygame.mixer.music.play(loops=-1, fade_ms=5000)
+    _current_bgm = path
+
+
+@dataclass
+class _Voice:
+    channel: pygame.mixer.Channel
+    sound: pygame.mixer.Sound
+    key: str
+    priority: int
+    started: int
+
+    @property
+    def playing(self) -> bool:
+        return self.channel.get_busy() and self.channel.get_sound() == self.sound
+
+
+class VoiceManager:
+    """
+    Hands out the mixer's channels to sound effects.
+    Caps how many instances of a sound play at once, attenuates and culls
+    positional sounds by their distance to the listener, and reuses the
+    channel of the least important voice when all of them are busy
+    """
+
+    N_CHANNELS = 16
+
+    def __init__(self) -> None:
+        pygame.mixer.set_num_channels(self.N_CHANNELS)
+        self.voices: List[_Voice] = []
+
+    @staticmethod
+    def spatialise(
+        sound_obj: SoundObj, pos: Sequence[float], listener_pos: Sequence[float]
+    ) -> Tuple[float, float]:
+        """
+        Left and right channel gain of a sound played at pos,
+        (0, 0) when it's out of hearing range
+
+        Parameters:
+            sound_obj: The sound being played
+            pos: World position of the sound
+            listener_pos: World position of the listener
+        """
+        dx = pos[0] - listener_pos[0]
+        dy = pos[1] - listener_pos[1]
+        distance = math.hypot(dx, dy)
+        if distance >= sound_obj.max_distance:
+            return 0, 0
+
+        gain = 1 - distance / sound_obj.max_distance
+        pan = max(-1, min(1, dx / sound_obj.max_distance))
+
+        return gain * min(1, 1 - pan), gain * min(1, 1 + pan)
+
+    @staticmethod
+    def _least_important(voices: List[_Voice]) -> Optional[_Voice]:
+        if not voices:
+            return None
+        return min(voices, key=lambda voice: (voice.priority, voice.started))
+
+    def play(
+        self,
+        key: str,
+        sound_obj: SoundObj,
+        pos: Optional[Sequence[float]] = None,
+        listener_pos: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Plays a decoded sound if there's a voice to spare for it
+
+        Parameters:
+            key: Name of the sound
+            sound_obj: The sound to play
+            pos: World position of the sound, None for non positional sounds
+            listener_pos: World position of the listener
+        """
+        left = right = 1
+        if pos is not None and listener_pos is not None:
+            left, right = self.spatialise(sound_obj, pos, listener_pos)
+            if not left and not right:
+                return
+
+        self.voices = [voice for voice in self.voices if voice.playing]
+
+        same_sound = [voice for voice in self.voices if voice.key == key]
+        if len(same_sound) >= sound_obj.max_voices:
+            # restart the oldest instance instead of stacking another one
+            voice = self._least_important(same_sound)
+            channel = voice.channel
+        else:
+            voice = None
+            channel = pygame.mixer.find_channel()
+
+        if channel is None:
+            voice = self._least_important(
+                [voice for voice in self.voices if voice.priority <= sound_obj.priority]
+            )
+            # everything playing matters more than this sound
+            if voice is None:
+                return
+            channel = voice.channel
+
+        if voice is not None:
+            self.voices.remove(voice)
+
+        channel.play(sound_obj.sound)
+        channel.set_volume(left, right)
+        self.voices.append(
+            _Voice(
+                channel,
+                sound_obj.sound,
+                key,
+                sound_obj.priority,
+                pygame.time.get_ticks(),
+            )
+        )
+
+
+VOICES = VoiceManager()
+
+
 class SFXManager:
     def __init__(self, state: str):
         self.sounds = load_sfx(state)
+        # Object with a `camera` rect in world space (library.ui.camera.Camera),
+        # positional sounds are heard relative to its center
+        self.listener = None
+
+        self.bgm = f"assets/audio/{state}/bgm.mp3" if "bgm" in self.sounds else None
+        # Volume percentage set once the state is shown, None keeps the current one
+        self.volume: Optional[float] = None
 
-        if "bgm" in self.sounds:
-            pygame.mixer.music.load(f"assets/audio/{state}/bgm.mp3")
-            pygame.mixer.music.play(loops=-1, fade_ms=5000)
+    def start_bgm(self) -> None:
+        """
+        Starts the state's background music, if it has any, and applies
+        its volume. Changes the mixer, so it's called on the main thread
+        once the state is shown, states may be built on a worker
+        """
+        if self.bgm is not None:
+            play_bgm(self.bgm)
+        if self.volume is not None:
+            self.set_volume(self.volume)
 
-    def play(self, sound_key: str):
+    def play(self, sound_key: str, pos: Optional[Sequence[float]] = None):
+        """
+        Plays a sound effect
+
+        Parameters:
+            sound_key: Name of the sound
+            pos: World position the sound comes from,
+                None if it should be heard the same anywhere
+        """
         sound_obj = self.sounds[sound_key]
-        sound = sound_obj.sound
-        sound.play()
+        # Sounds still decoding are skipped rather than waited for
+        if not sound_obj.ready():
+            return
+
+        listener_pos = None
+        if self.listener is not None:
+            listener_pos = self.listener.camera.center
+
+        VOICES.play(sound_key, sound_obj, pos, listener_pos)
 
     def set_volume(self, percentage: float):
         for sound_obj in self.sounds.values():
-            volume = (percentage / 100) * sound_obj.original_volume
-            sound_obj.sound.set_volume(volume)
+            sound_obj.volume = (percentage / 100) * sound_obj.original_volume
+            if sound_obj.ready():
+                sound_obj.sound.set_volume(sound_obj.volume)
 
         if pygame.mixer.music.get_busy():
             volume = (percentage / 100) * self.sounds["bgm"].original_volume
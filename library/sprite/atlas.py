@@ -0,0 +1,117 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Packs small sprites into shared atlas surfaces
+"""
+
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import pygame
+
+from library.sprite import formats
+
+# Sprites with a side longer than this keep their own surface
+MAX_SPRITE_SIDE = 64
+MAX_PAGE_SIZE = 1024
+# Transparent gap around each sprite
+PADDING = 1
+
+
+def pack(
+    sizes: Dict[Hashable, Tuple[int, int]], max_size: int = MAX_PAGE_SIZE
+) -> List[Tuple[Tuple[int, int], Dict[Hashable, pygame.Rect]]]:
+    """
+    Places rectangles of the given sizes on as few pages as possible,
+    row by row, tallest first
+
+    Parameters:
+        sizes: {key: (width, height)}
+        max_size: Maximum width and height of a page
+
+    Returns:
+        [(page size, {key: rect on the page}), ...]
+    """
+    total_area = sum((w + PADDING) * (h + PADDING) for w, h in sizes.values())
+    widest = max((w + PADDING for w, _ in sizes.values()), default=1)
+    # Roughly square pages, rounded up to a power of two
+    width = 1
+    while width < min(max(widest, int(total_area**0.5)), max_size):
+        width *= 2
+
+    pages = []
+    rects = {}
+    x = y = shelf_height = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+        if x + w + PADDING > width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        if y + h + PADDING > max_size:
+            pages.append(((width, y), rects))
+            rects = {}
+            x = y = shelf_height = 0
+
+        rects[key] = pygame.Rect(x + PADDING, y + PADDING, w, h)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h + PADDING)
+
+    if rects:
+        pages.append(((width, y + shelf_height + PADDING), rects))
+
+    return pages
+
+
+def build(images: Dict[Hashable, pygame.Surface]) -> Dict[Hashable, pygame.Surface]:
+    """
+    Copies images into shared atlas pages. Images that are only ever
+    fully opaque or fully transparent go on colorkeyed pages,
+    the rest on pages with per pixel alpha
+
+    Parameters:
+        images: {key: surface}, every surface must fit on a page
+
+    Returns:
+        {key: subsurface of an atlas page holding the image}
+    """
+    sprites = {}
+    images = {key: image.convert_alpha() for key, image in images.items()}
+    groups = {True: {}, False: {}}
+    for key, image in images.items():
+        groups[formats.classify(image) == formats.ALPHA][key] = image.get_size()
+
+    for needs_alpha, sizes in groups.items():
+        for size, rects in pack(sizes):
+            page = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+            page.fill((0, 0, 0, 0))
+
+            for key, rect in rects.items():
+                # Taking the maximum with the transparent page copies the pixels
+                # as they are, regular alpha blending would darken the edges
+                page.blit(images[key], rect, special_flags=pygame.BLEND_RGBA_MAX)
+
+            if not needs_alpha:
+                page = formats.finalise(page, rle=False)
+
+            for key, rect in rects.items():
+                sprites[key] = page.subsurface(rect)
+
+    return sprites
+
+
+def fits(size: Tuple[int, int]) -> bool:
+    """
+    Whether an image of the given size is small enough to go into an atlas
+    """
+    return 0 < max(size) <= MAX_SPRITE_SIDE
+
+
+def page_size(surfaces: Iterable[pygame.Surface]) -> int:
+    """
+    Amount of bytes taken up by the distinct atlas pages
+    the given subsurfaces lie on
+    """
+    pages = {id(page): page for page in (s.get_abs_parent() for s in surfaces)}
+    return sum(
+        page.get_bytesize() * page.get_width() * page.get_height()
+        for page in pages.values()
+    )
@@ -0,0 +1,127 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+On-disk cache of decoded images, so launches after the first
+map raw pixels from disk instead of decoding PNGs again
+"""
+
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pygame
+
+logger = logging.getLogger()
+
+CACHE_DIR = Path(".cache/decoded/")
+
+# The browser build's file system doesn't outlive the page
+ENABLED = sys.platform != "emscripten"
+
+# Images with fewer pixels decode faster than they're hashed and mapped
+MIN_PIXELS = 128 * 128
+
+# Bumped when the cached format changes, so old files aren't used
+_VERSION = b"1"
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"RGBA"
+
+
+def load(path, data: Optional[dict] = None) -> pygame.Surface:
+    """
+    Decodes an image, resized to the "scale" in its metadata if given.
+    Safe to call from decode threads, the result isn't converted
+    to the display format yet
+
+    Parameters:
+        path: Path of the image
+        data: The image's entry in its metadata.json
+    """
+    raw = Path(path).read_bytes()
+    scale = data.get("scale") if data else None
+    width, height = png_size(raw)
+    cached = ENABLED and (scale is not None or width * height >= MIN_PIXELS)
+
+    if cached:
+        # The pixels depend on the PNG and on how its metadata processes it,
+        # changing either gives a new file name
+        digest = hashlib.sha1(raw)
+        digest.update(json.dumps(data, sort_keys=True).encode())
+        digest.update(_VERSION)
+
+        prefix = hashlib.sha1(str(path).encode()).hexdigest()[:12]
+        cache_path = CACHE_DIR / f"{prefix}-{digest.hexdigest()}.rgba"
+
+        image = _read(cache_path)
+        if image is not None:
+            return image
+
+    image = pygame.image.load(io.BytesIO(raw), Path(path).name)
+    if scale is not None:
+        image = pygame.transform.scale(image, scale)
+
+    if cached:
+        _write(cache_path, prefix, image)
+
+    return image
+
+
+def png_size(raw: bytes) -> Tuple[int, int]:
+    """
+    Size of a PNG read from its header, (0, 0) if it isn't one
+
+    Parameters:
+        raw: The file's contents, at least its first 24 bytes
+    """
+    if raw[:8] != b"\x89PNG\r\n\x1a\n":
+        return 0, 0
+
+    return struct.unpack(">II", raw[16:24])
+
+
+def _read(cache_path: Path) -> Optional[pygame.Surface]:
+    try:
+        with open(cache_path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    # padded so a truncated file fails the checks below instead of raising
+    header = buffer[: _HEADER.size].ljust(_HEADER.size, b"\0")
+    magic, width, height = _HEADER.unpack(header)
+    if magic != _MAGIC or len(buffer) != _HEADER.size + width * height * 4:
+        logger.warning(f"Ignoring corrupt cache file {cache_path}")
+        return None
+
+    # The surface keeps the mapping alive and reads straight from it,
+    # converting to the display format makes the only copy
+    return pygame.image.frombuffer(
+        memoryview(buffer)[_HEADER.size :], (width, height), "RGBA"
+    )
+
+
+def _write(cache_path: Path, prefix: str, image: pygame.Surface) -> None:
+    temp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.tmp")
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Files cached from an older version of the image
+        for stale in CACHE_DIR.glob(f"{prefix}-*.rgba"):
+            stale.unlink()
+
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, *image.get_size()))
+            f.write(pygame.image.tobytes(image, "RGBA"))
+
+        os.replace(temp_path, cache_path)
+    except OSError:
+        logger.warning(f"Couldn't cache {cache_path}", exc_info=True)
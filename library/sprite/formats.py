@@ -0,0 +1,138 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Picks the cheapest blit format for a surface from its pixels
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import pygame
+
+logger = logging.getLogger()
+
+OPAQUE = "opaque"
+COLORKEY = "colorkey"
+ALPHA = "alpha"
+
+# Tried in order as the colorkey, the first one the image doesn't use wins
+_KEY_COLORS = ((255, 0, 255), (0, 255, 255), (1, 2, 3), (254, 253, 252))
+
+
+def classify(surface: pygame.Surface) -> str:
+    """
+    Whether a surface's pixels are all opaque, only fully opaque or
+    fully transparent (a colorkey can stand in for alpha),
+    or need per pixel alpha
+    """
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return OPAQUE if surface.get_colorkey() is None else COLORKEY
+
+    area = surface.get_width() * surface.get_height()
+    opaque = pygame.mask.from_surface(surface, 254).count()
+    if opaque == area:
+        return OPAQUE
+
+    visible = pygame.mask.from_surface(surface, 0).count()
+    return COLORKEY if visible == opaque else ALPHA
+
+
+def _free_color(surface: pygame.Surface) -> Optional[tuple]:
+    for color in _KEY_COLORS:
+        if not pygame.mask.from_threshold(surface, color, (1, 1, 1, 255)).count():
+            return color
+    return None
+
+
+def finalise(surface: pygame.Surface, rle: bool = True) -> pygame.Surface:
+    """
+    Converts a surface to the display format, opaque if it has no
+    transparency, colorkeyed if it's only ever fully transparent,
+    with per pixel alpha otherwise
+
+    Parameters:
+        surface: Surface to convert
+        rle: Whether colorkeyed results get RLE acceleration.
+            Surfaces that get sliced into subsurfaces mustn't,
+            RLE encoding frees the pixels the subsurfaces point to
+    """
+    kind = classify(surface)
+    flags = pygame.RLEACCEL if rle else 0
+
+    if kind == OPAQUE:
+        return surface.convert()
+    if kind == ALPHA:
+        return surface.convert_alpha()
+
+    if not surface.get_flags() & pygame.SRCALPHA:
+        result = surface.convert()
+        result.set_colorkey(surface.get_colorkey(), flags)
+        return result
+
+    key = _free_color(surface)
+    if key is None:
+        return surface.convert_alpha()
+
+    # Transparent pixels are painted with the key, the rest stays as is
+    result = surface.convert()
+    pygame.mask.from_surface(surface, 254).to_surface(
+        result, setcolor=None, unsetcolor=key
+    )
+    result.set_colorkey(key, flags)
+    return result
+
+
+def accelerate(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Turns on RLE acceleration for a colorkeyed surface, subsurfaces
+    included as they keep their own copy of the encoded pixels
+    """
+    key = surface.get_colorkey()
+    if key is not None:
+        surface.set_colorkey(key, pygame.RLEACCEL)
+    return surface
+
+
+def slow_reason(surface: pygame.Surface) -> Optional[str]:
+    """
+    Why blitting a surface takes a slower path than it could, if it does
+    """
+    display = pygame.display.get_surface()
+    has_alpha = surface.get_flags() & pygame.SRCALPHA
+
+    if display is not None:
+        masks = surface.get_masks()
+        display_masks = display.get_masks()[:3]
+        if surface.get_bitsize() != display.get_bitsize() or masks[:3] != display_masks:
+            return "isn't in the display format, it's converted on every blit"
+
+    if has_alpha and classify(surface) != ALPHA:
+        return "has per pixel alpha it doesn't need"
+
+    rle_flags = pygame.RLEACCEL | pygame.RLEACCELOK
+    if surface.get_colorkey() is not None and not surface.get_flags() & rle_flags:
+        return "is colorkeyed without RLE acceleration"
+
+    return None
+
+
+def report(surfaces: Dict[str, pygame.Surface], label: str) -> List[str]:
+    """
+    Logs the surfaces that are on slow blit paths
+
+    Parameters:
+        surfaces: {name: surface}
+        label: What the surfaces belong to, for the log
+
+    Returns:
+        Names of the slow surfaces
+    """
+    slow = []
+    for name, surface in surfaces.items():
+        reason = slow_reason(surface)
+        if reason is not None:
+            slow.append(name)
+            logger.info(f"{label}: {name} {reason}")
+
+    return slow
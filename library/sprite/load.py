@@ -5,13 +5,68 @@ The source code is distributed under the MIT license.
 
 import json
 import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pygame
 
+from library.perf.trace import TRACER
+from library.registry import ASSETS, Lease
+from library.scheduler import SCHEDULER
+from library.sprite import atlas, cache, formats
+
 logger = logging.getLogger()
 
+IMAGES_DIR = Path("assets/images/")
+
+# Threads decoding PNGs in load_assets, 1 decodes on the calling thread.
+# The browser build has no threads to spare
+DECODE_WORKERS = 1 if sys.platform == "emscripten" else min(4, os.cpu_count() or 1)
+
+_decoder: Optional[ThreadPoolExecutor] = None
+
+ManifestEntry = Tuple[str, Path, dict]
+
+
+def surface_size(asset) -> int:
+    """
+    Amount of bytes taken up by a loaded image asset
+    (a surface or a list of subsurfaces of one sprite sheet)
+    """
+    if isinstance(asset, list):
+        asset = asset[0].get_abs_parent()
+
+    return asset.get_bytesize() * asset.get_width() * asset.get_height()
+
+
+def load_image(path, convert_alpha: bool = True) -> pygame.Surface:
+    """
+    Loads an image converted to the cheapest display format for its
+    pixels, reusing it if it's already resident in the asset registry
+
+    Parameters:
+        path: Path of the image
+        convert_alpha: Whether the image may have transparency,
+            False converts it to an opaque surface right away
+    """
+
+    return ASSETS.get(
+        ("image", str(path), convert_alpha),
+        lambda: formats.accelerate(_convert(cache.load(path), convert_alpha)),
+        surface_size,
+    )
+
+
+def _convert(image: pygame.Surface, convert_alpha: bool) -> pygame.Surface:
+    # RLE is turned on for the final surfaces, sprite sheets are sliced first
+    return formats.finalise(image, rle=False) if convert_alpha else image.convert()
+
 
 def get_images(
     sheet: pygame.Surface,
@@ -48,30 +103,197 @@ def get_images(
     return images
 
 
-def load_assets(state: str) -> dict:
-    assets = {}
-    path = Path("assets/images/")
+@lru_cache()
+def get_manifest() -> Dict[str, List[ManifestEntry]]:
+    """
+    Index of every image's metadata keyed by the states using it,
+    built once per process from the metadata.json files
+
+    Returns:
+        {state: [(asset name, image path, metadata), ...]}
+    """
+    manifest = defaultdict(list)
 
-    json_files = path.rglob("*.json")
-    for metadata_f in json_files:
+    for metadata_f in sorted(IMAGES_DIR.rglob("*.json")):
         metadata = json.loads(metadata_f.read_text())
         for file, data in metadata.items():
-            if state not in data["states"]:
-                continue
-
-            complete_path = metadata_f.parent / file
-            logger.info(f"Loaded {complete_path}")
-            if data["convert_alpha"]:
-                image = pygame.image.load(complete_path).convert_alpha()
-            else:
-                image = pygame.image.load(complete_path).convert()
-
-            if data["sprite_sheet"] is None:
-                asset = image
-            else:
-                asset = get_images(image, *data["sprite_sheet"].values())
-
-            file_extension = file[file.find(".") :]
-            assets[file.replace(file_extension, "")] = asset
+            name = file[: file.find(".")]
+            for state in data["states"]:
+                manifest[state].append((name, metadata_f.parent / file, data))
+
+    return dict(manifest)
+
+
+def _asset_key(path: Path, data: dict) -> tuple:
+    if data["sprite_sheet"] is None:
+        return "image", str(path), data["convert_alpha"]
+    return "sprite_sheet", str(path)
+
+
+def _decode(path: Path, data: dict) -> Future:
+    """
+    Starts decoding an image, pygame releases the GIL while doing so
+    """
+    global _decoder
+
+    if DECODE_WORKERS <= 1:
+        future = Future()
+        future.set_result(cache.load(path, data))
+        return future
+
+    if _decoder is None:
+        _decoder = ThreadPoolExecutor(DECODE_WORKERS, thread_name_prefix="decode")
+    return _decoder.submit(cache.load, path, data)
+
+
+def _finalise(image: pygame.Surface, data: dict):
+    return _slice(_convert(image, data["convert_alpha"]), data)
+
+
+def _slice(image: pygame.Surface, data: dict):
+    if data["sprite_sheet"] is None:
+        return formats.accelerate(image)
+    return [
+        formats.accelerate(sprite)
+        for sprite in get_images(image, *data["sprite_sheet"].values())
+    ]
+
+
+@lru_cache()
+def _png_size(path: Path) -> Tuple[int, int]:
+    with open(path, "rb") as f:
+        return cache.png_size(f.read(24))
+
+
+def _atlased(path: Path, data: dict) -> bool:
+    """
+    Whether an image goes into its state's atlas,
+    only small ones with per pixel alpha do
+    """
+    return (
+        data["convert_alpha"]
+        and data.get("scale") is None
+        and atlas.fits(_png_size(path))
+    )
+
+
+def _atlas_size(assets: dict) -> int:
+    return atlas.page_size(
+        asset[0] if isinstance(asset, list) else asset for asset in assets.values()
+    )
+
+
+def _manifest_entry(state: str, name: str) -> ManifestEntry:
+    for entry in get_manifest().get(state, []):
+        if entry[0] == name:
+            return entry
+
+    raise KeyError(f"{name} isn't an asset of {state}")
+
+
+def load_asset(state: str, name: str, lease: Optional[Lease] = None):
+    """
+    Loads a single asset of a state, e.g. one marked as lazy
+    that load_assets leaves out
+
+    Parameters:
+        state: State the asset belongs to
+        name: Name of the asset
+        lease: Lease to record the reference in
+    """
+    _, path, data = _manifest_entry(state, name)
+
+    return ASSETS.get(
+        _asset_key(path, data),
+        lambda: _finalise(cache.load(path, data), data),
+        surface_size,
+        lease,
+    )
+
+
+def prefetch_asset(state: str, name: str, lease: Optional[Lease] = None) -> None:
+    """
+    Starts loading a single asset of a state in the background,
+    so load_asset finds it resident later on.
+    Decoding runs on the decode threads, converting to the
+    display format in idle frame time
+
+    Parameters:
+        state: State the asset belongs to
+        name: Name of the asset
+        lease: Lease to record the reference in
+    """
+    _, path, data = _manifest_entry(state, name)
+    key = _asset_key(path, data)
+    if key in ASSETS:
+        return
+
+    def finish(future: Future):
+        SCHEDULER.add(
+            lambda: ASSETS.get(
+                key, lambda: _finalise(future.result(), data), surface_size, lease
+            )
+        )
+
+    _decode(path, data).add_done_callback(finish)
+
+
+@TRACER.traced()
+def load_assets(state: str) -> dict:
+    """
+    Loads every asset of a state, except for the ones marked as lazy.
+    Small sprites are returned as subsurfaces of shared atlas pages
+    """
+    start = time.perf_counter()
+    entries = [
+        entry for entry in get_manifest().get(state, []) if not entry[2].get("lazy")
+    ]
+    atlased = [entry for entry in entries if _atlased(entry[1], entry[2])]
+    separate = [entry for entry in entries if entry not in atlased]
+    # The atlas is resident as a whole, keyed by the images on it
+    atlas_key = ("atlas", state, tuple(str(path) for _, path, _ in atlased))
+
+    pending = [
+        entry for entry in separate if _asset_key(entry[1], entry[2]) not in ASSETS
+    ]
+    if atlased and atlas_key not in ASSETS:
+        pending += atlased
+
+    # Decode everything that isn't resident yet in parallel,
+    # converting to the display format stays on this thread
+    decoding = {path: _decode(path, data) for _, path, data in pending}
+
+    def decoded(path: Path, data: dict) -> pygame.Surface:
+        future = decoding.get(path)
+        return cache.load(path, data) if future is None else future.result()
+
+    def build_atlas() -> dict:
+        sprites = atlas.build(
+            {name: decoded(path, data) for name, path, data in atlased}
+        )
+        return {name: _slice(sprites[name], data) for name, _, data in atlased}
+
+    assets = {}
+    for name, path, data in separate:
+        assets[name] = ASSETS.get(
+            _asset_key(path, data),
+            lambda: _finalise(decoded(path, data), data),
+            surface_size,
+        )
+    if atlased:
+        assets.update(ASSETS.get(atlas_key, build_atlas, _atlas_size))
+
+    if decoding:
+        logger.info(
+            f"Loaded {len(decoding)} images for {state} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        formats.report(
+            {
+                name: asset[0] if isinstance(asset, list) else asset
+                for name, asset in assets.items()
+            },
+            state,
+        )
 
     return assets
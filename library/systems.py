@@ -0,0 +1,114 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Runs a game state's update and draw work as a list of named systems
+that can be reordered, skipped, disabled and timed
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from library.perf.trace import TRACER
+
+UPDATE = "update"
+DRAW = "draw"
+
+
+@dataclass
+class System:
+    name: str
+    run: Callable[..., None]
+    # The system is skipped for the frame when it returns something falsy
+    when: Optional[Callable[[], object]] = None
+    enabled: bool = True
+    # Smoothed seconds a run takes, 0 while the system is skipped
+    time: float = 0.0
+
+
+class SystemScheduler:
+    """
+    Holds the systems of each phase in the order they run
+    """
+
+    # Weight of the latest run in the smoothed times
+    SMOOTHING = 0.1
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, List[System]] = {UPDATE: [], DRAW: []}
+
+    def add(
+        self,
+        phase: str,
+        name: str,
+        run: Callable[..., None],
+        when: Optional[Callable[[], object]] = None,
+        before: Optional[str] = None,
+    ) -> System:
+        """
+        Adds a system to a phase
+
+        Parameters:
+            phase: UPDATE or DRAW
+            name: Name of the system, unique within the phase
+            run: Called with the arguments the phase is run with
+            when: Predicate deciding whether the system runs this frame
+            before: Name of a system to run before, the system
+                goes at the end of the phase otherwise
+        """
+        system = System(name, run, when)
+        systems = self.phases[phase]
+        if before is None:
+            systems.append(system)
+        else:
+            systems.insert(systems.index(self.get(phase, before)), system)
+
+        return system
+
+    def get(self, phase: str, name: str) -> System:
+        for system in self.phases[phase]:
+            if system.name == name:
+                return system
+
+        raise KeyError(f"No {phase} system named {name!r}")
+
+    def enable(
+        self, name: str, enabled: bool = True, phase: Optional[str] = None
+    ) -> None:
+        """
+        Turns the systems with the given name on or off,
+        in one phase or in every phase
+        """
+        found = False
+        phases = self.phases.values() if phase is None else (self.phases[phase],)
+        for systems in phases:
+            for system in systems:
+                if system.name == name:
+                    system.enabled = enabled
+                    found = True
+
+        if not found:
+            raise KeyError(f"No system named {name!r}")
+
+    def run(self, phase: str, *args) -> None:
+        """
+        Runs the enabled systems of a phase whose predicate holds
+        """
+        for system in self.phases[phase]:
+            if not system.enabled or (system.when is not None and not system.when()):
+                system.time -= system.time * self.SMOOTHING
+                continue
+
+            start = time.perf_counter()
+            system.run(*args)
+            end = time.perf_counter()
+            system.time += (end - start - system.time) * self.SMOOTHING
+            if TRACER.enabled:
+                TRACER.record(f"{phase} {system.name}", start, end)
+
+    def timings(self, phase: str) -> Dict[str, float]:
+        """
+        Smoothed milliseconds each system of a phase takes
+        """
+        return {system.name: system.time * 1000 for system in self.phases[phase]}
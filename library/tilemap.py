@@ -3,16 +3,17 @@ This file is a part of the 'Unnamed' source code.
 The source code is distributed under the MIT license.
 """
 
-from multiprocessing.sharedctypes import Value
 import pathlib
-import typing
 from typing import Optional, Sequence
 
 import pygame
-import pytmx 
+import pytmx
+
+from library.perf.trace import TRACER
 
 from .tiles import SpikeTile, Tile
 
+
 class TileLayerMap:
     """
     Adds some functions like render_map and make_map to enhance pytmx's tilemap
@@ -86,7 +87,7 @@ class TileLayerMap:
 
                         self.special_tiles[(x, y)] = tile_instance
 
-
+    @TRACER.traced()
     def make_map(self, tileset: Optional[Sequence] = None) -> pygame.Surface:
         """
         Makes a pygame.Surface, then render the map and return the rendered map
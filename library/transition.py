@@ -62,5 +62,12 @@ class FadeTransition:
 
         self.image.set_alpha(int(self.alpha))
 
+    @property
+    def covering(self) -> bool:
+        """
+        Whether the transition hides the whole screen
+        """
+        return self.alpha >= 255
+
     def draw(self, screen: pygame.Surface) -> None:
         screen.blit(self.image, (0, 0))
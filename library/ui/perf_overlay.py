@@ -0,0 +1,100 @@
+"""
+This file is a part of the 'Unnamed' source code.
+The source code is distributed under the MIT license.
+
+Shows frame timings and the quality tier on top of the game
+"""
+
+from typing import List, Optional
+
+import pygame
+
+from library.events import EventBus
+from library.perf.gc_policy import GCPolicy
+from library.perf.quality import QualityGovernor
+from library.systems import DRAW, UPDATE
+from library.utils import font
+
+
+class PerfOverlay:
+    """
+    Frame rate, frame time, quality tier, garbage collection pauses
+    and the slowest systems of the current state, toggled with a key
+    """
+
+    COLOR = (218, 224, 234)
+    BACKGROUND = (0, 0, 0, 150)
+    # Amount of systems listed per phase
+    N_SYSTEMS = 4
+
+    def __init__(
+        self,
+        quality: QualityGovernor,
+        gc_policy: Optional[GCPolicy] = None,
+        key: int = pygame.K_F3,
+    ) -> None:
+        """
+        Parameters:
+            quality: Governor whose tier is shown
+            gc_policy: Policy whose collection pauses are shown
+            key: Key showing and hiding the overlay
+        """
+        self.quality = quality
+        self.gc_policy = gc_policy
+        self.key = key
+        self.visible = False
+        self.font = font(size=16)
+
+    def watch(self, events: EventBus) -> None:
+        events.subscribe(pygame.KEYDOWN, self._toggle, key=self.key)
+
+    def _toggle(self, _event: pygame.event.Event) -> None:
+        self.visible = not self.visible
+
+    def lines(self, fps: float, frame_time: float, game_state) -> List[str]:
+        """
+        Parameters:
+            fps: Frames presented per second
+            frame_time: Seconds the last frame took to update and draw
+            game_state: State whose systems get listed, if it has any
+        """
+        lines = [
+            f"{fps:.1f} fps  {frame_time * 1000:.1f}ms",
+            f"quality: {self.quality.tier.name}",
+        ]
+        if self.gc_policy is not None:
+            # Explicit collections run behind transitions, they're listed apart
+            pauses = self.gc_policy.pauses()
+            last_pause = pauses[-1] if pauses else 0.0
+            lines.append(
+                f"gc pauses: last {last_pause * 1000:.2f}ms"
+                f", max {max(pauses, default=0.0) * 1000:.2f}ms"
+            )
+            lines.append(
+                f"gc settles: {self.gc_policy.settles}"
+                f", last {self.gc_policy.settle_time * 1000:.1f}ms"
+            )
+
+        systems = getattr(game_state, "systems", None)
+        if systems is not None:
+            for phase in (UPDATE, DRAW):
+                timings = sorted(
+                    systems.timings(phase).items(), key=lambda item: -item[1]
+                )
+                for name, ms in timings[: self.N_SYSTEMS]:
+                    lines.append(f"{phase} {name}: {ms:.2f}ms")
+
+        return lines
+
+    def draw(self, screen: pygame.Surface, lines: List[str]) -> None:
+        images = [self.font.render(line, False, self.COLOR) for line in lines]
+        height = self.font.get_linesize()
+        panel = pygame.Surface(
+            (max(image.get_width() for image in images) + 8, height * len(images) + 8),
+            pygame.SRCALPHA,
+        )
+        panel.fill(self.BACKGROUND)
+        for i, image in enumerate(images):
+            panel.blit(image, (4, 4 + i * height))
+
+        screen.blit(panel, (4, 4))
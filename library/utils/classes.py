@@ -85,3 +85,21 @@ class Expansion:
         else:
             if self.number > self.lower_limit:
                 self.number -= self.speed * dt
+
+
+class LazyDict(dict):
+    """
+    Dictionary loading missing values on first access
+    """
+
+    def __init__(self, loader):
+        """
+        Parameters:
+            loader: Called with a missing key, returns its value
+        """
+        super().__init__()
+        self.loader = loader
+
+    def __missing__(self, key):
+        value = self[key] = self.loader(key)
+        return value
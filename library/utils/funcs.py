@@ -4,12 +4,96 @@ The source code is distributed under the MIT license.
 """
 
 import math
-import time
-from typing import Sequence
+import threading
+from collections import OrderedDict
+from typing import Callable, Sequence
 
 import pygame
 
 
+class TransformCache:
+    """
+    Memoises transformed surfaces, so every rotated, scaled or flipped
+    variant of an image is computed once per process.
+    The results are shared, they mustn't be drawn on
+    """
+
+    def __init__(self, budget: int) -> None:
+        """
+        Parameters:
+            budget: Amount of bytes the cached results may take up,
+                the least recently used ones are dropped beyond it
+        """
+        self.budget = budget
+        self.size = 0
+        self.hits = self.misses = 0
+
+        # The source is kept in the entry so its id can't be reused
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, op: Callable, source: pygame.Surface, *params) -> pygame.Surface:
+        """
+        Returns op(source, *params), computing it if it isn't cached
+
+        Parameters:
+            op: A pygame.transform function
+            source: Surface to transform
+            params: Remaining arguments of op, must be hashable
+        """
+        key = (op, id(source), params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        result = op(source, *params)
+        size = result.get_bytesize() * result.get_width() * result.get_height()
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = (source, result, size)
+                self.size += size
+
+            while self.size > self.budget and len(self._entries) > 1:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+TRANSFORMS = TransformCache(budget=16 * 1024 * 1024)
+
+
+def scaled(surf: pygame.Surface, size) -> pygame.Surface:
+    """
+    Shared copy of surf scaled to size
+    """
+    return TRANSFORMS.get(pygame.transform.scale, surf, tuple(size))
+
+
+def rotated(surf: pygame.Surface, angle: float) -> pygame.Surface:
+    """
+    Shared copy of surf rotated by angle degrees
+    """
+    return TRANSFORMS.get(pygame.transform.rotate, surf, angle)
+
+
+def flipped(surf: pygame.Surface, flip_x: bool, flip_y: bool) -> pygame.Surface:
+    """
+    Shared copy of surf flipped along the given axes
+    """
+    return TRANSFORMS.get(pygame.transform.flip, surf, flip_x, flip_y)
+
+
 def circle_surf(radius, color):
     surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
     pygame.draw.circle(surf, color, (radius, radius), radius)
@@ -27,7 +111,7 @@ def camerify(coord, camera):
 
 
 def rotate(extract, angle):
-    dump = [pygame.transform.rotate(img, angle) for img in extract]
+    dump = [rotated(img, angle) for img in extract]
 
     return dump
 
@@ -42,13 +126,11 @@ def resize(extract: Sequence[pygame.Surface], scale: float):
         extract[0].get_width() * scale,
         extract[0].get_height() * scale,
     )
-    scaled = [pygame.transform.scale(img, (width, height)) for img in extract]
-
-    return scaled
+    return [scaled(img, (width, height)) for img in extract]
 
 
 def flip_images(extract: Sequence):
-    flipped_images = [pygame.transform.flip(img, True, False) for img in extract]
+    flipped_images = [flipped(img, True, False) for img in extract]
 
     return flipped_images
 